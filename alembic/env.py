@@ -13,11 +13,16 @@ from sqlmodel import SQLModel
 from app.api.models.user.db import User, Session
 from app.api.models.products.db.product_review import Review
 from app.api.models.products.db.inventory import Inventory
+from app.api.models.products.db.product_stock import ProductStock
+from app.api.models.products.db.product_rating import ProductRating
+from app.api.models.products.db.inventory_sync import InventorySync
 from app.api.models.products.db.product import Product
 from app.api.models.products.db.product_category import ProductCategory
 from app.api.models.products.db.product_image import ProductImage
 from app.api.models.products.db.warehouse import Warehouse
 from app.api.models.cart.db.cart import Cart
+from app.api.models.products.db.product_import import ProductImport, ProductImportError
+from app.api.models.orders.db.order import Order, OrderItem
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,32 @@
+"""review feed indexes
+
+Revision ID: 0c9e4a6f2b58
+Revises: f4c1b8e3d972
+Create Date: 2026-10-17 18:05:13.770422
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c9e4a6f2b58'
+down_revision: Union[str, None] = 'f4c1b8e3d972'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('reviews', sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.create_index('ix_reviews_product_id_created_at_id', 'reviews', ['product_id', 'created_at', 'id'],
+                    unique=False)
+    op.create_index('ix_reviews_product_id_rating_created_at_id', 'reviews',
+                    ['product_id', 'rating', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_product_id_rating_created_at_id', table_name='reviews')
+    op.drop_index('ix_reviews_product_id_created_at_id', table_name='reviews')
+    op.drop_column('reviews', 'created_at')
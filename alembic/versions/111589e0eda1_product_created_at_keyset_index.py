@@ -0,0 +1,28 @@
+"""product created_at keyset index
+
+Revision ID: 111589e0eda1
+Revises: 3f8e2a6c1d07
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '111589e0eda1'
+down_revision: Union[str, None] = '3f8e2a6c1d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.drop_column('products', 'created_at')
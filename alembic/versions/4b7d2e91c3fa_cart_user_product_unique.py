@@ -0,0 +1,39 @@
+"""cart user product unique
+
+Revision ID: 4b7d2e91c3fa
+Revises: e9da718a90b3
+Create Date: 2026-10-17 14:02:37.615204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7d2e91c3fa'
+down_revision: Union[str, None] = 'e9da718a90b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # fold duplicate (user_id, product_id) rows into one, keeping the summed quantity
+    op.execute("""
+        UPDATE cart SET quantity = totals.quantity
+        FROM (
+            SELECT user_id, product_id, sum(quantity) AS quantity
+            FROM cart GROUP BY user_id, product_id HAVING count(*) > 1
+        ) AS totals
+        WHERE cart.user_id = totals.user_id AND cart.product_id = totals.product_id
+    """)
+    op.execute("""
+        DELETE FROM cart USING cart AS kept
+        WHERE cart.user_id = kept.user_id AND cart.product_id = kept.product_id AND cart.id > kept.id
+    """)
+    op.create_unique_constraint('uq_cart_user_id_product_id', 'cart', ['user_id', 'product_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_cart_user_id_product_id', 'cart', type_='unique')
@@ -0,0 +1,34 @@
+"""product children cascade
+
+Revision ID: 5d1f0a7c3e84
+Revises: 0c9e4a6f2b58
+Create Date: 2026-10-17 21:34:18.240517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f0a7c3e84'
+down_revision: Union[str, None] = '0c9e4a6f2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# rows that belong to a product and go with it; order_items keeps its plain foreign key
+CHILD_TABLES = ('product_images', 'reviews', 'inventories', 'cart')
+
+
+def upgrade() -> None:
+    for table in CHILD_TABLES:
+        op.drop_constraint(f'{table}_product_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(f'{table}_product_id_fkey', table, 'products', ['product_id'], ['id'],
+                              ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table in CHILD_TABLES:
+        op.drop_constraint(f'{table}_product_id_fkey', table, type_='foreignkey')
+        op.create_foreign_key(f'{table}_product_id_fkey', table, 'products', ['product_id'], ['id'])
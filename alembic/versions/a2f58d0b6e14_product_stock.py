@@ -0,0 +1,59 @@
+"""product stock
+
+Revision ID: a2f58d0b6e14
+Revises: 7e3a9c1d5b20
+Create Date: 2026-10-17 16:04:11.902716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f58d0b6e14'
+down_revision: Union[str, None] = '7e3a9c1d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_stock',
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION inventories_product_stock_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE product_stock SET quantity = quantity - OLD.quantity WHERE product_id = OLD.product_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO product_stock (product_id, quantity) VALUES (NEW.product_id, NEW.quantity)
+                ON CONFLICT (product_id) DO UPDATE SET quantity = product_stock.quantity + EXCLUDED.quantity;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    # deferred to commit, so the per-product row is locked only briefly instead of for the
+    # whole checkout transaction, which would serialize checkouts of a hot product again
+    op.execute("""
+        CREATE CONSTRAINT TRIGGER inventories_product_stock_trigger
+        AFTER INSERT OR UPDATE OF product_id, quantity OR DELETE ON inventories
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION inventories_product_stock_update()
+    """)
+    op.execute("""
+        INSERT INTO product_stock (product_id, quantity)
+        SELECT product_id, sum(quantity) FROM inventories GROUP BY product_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS inventories_product_stock_trigger ON inventories")
+    op.execute("DROP FUNCTION IF EXISTS inventories_product_stock_update()")
+    op.drop_table('product_stock')
@@ -0,0 +1,50 @@
+"""inventory adjustments
+
+Revision ID: d83c6f27a9e5
+Revises: a2f58d0b6e14
+Create Date: 2026-10-17 16:48:29.054183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83c6f27a9e5'
+down_revision: Union[str, None] = 'a2f58d0b6e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # fold duplicate (product_id, warehouse_id) rows into one; product_stock totals are unchanged
+    op.execute("""
+        UPDATE inventories SET quantity = totals.quantity
+        FROM (
+            SELECT product_id, warehouse_id, sum(quantity) AS quantity
+            FROM inventories GROUP BY product_id, warehouse_id HAVING count(*) > 1
+        ) AS totals
+        WHERE inventories.product_id = totals.product_id AND inventories.warehouse_id = totals.warehouse_id
+    """)
+    op.execute("""
+        DELETE FROM inventories USING inventories AS kept
+        WHERE inventories.product_id = kept.product_id AND inventories.warehouse_id = kept.warehouse_id
+          AND inventories.id > kept.id
+    """)
+    op.create_unique_constraint('uq_inventories_product_id_warehouse_id', 'inventories',
+                                ['product_id', 'warehouse_id'])
+    op.create_table('inventory_syncs',
+    sa.Column('sync_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('results', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('sync_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inventory_syncs')
+    op.drop_constraint('uq_inventories_product_id_warehouse_id', 'inventories', type_='unique')
@@ -0,0 +1,50 @@
+"""product imports
+
+Revision ID: e9da718a90b3
+Revises: c61e6009b0a4
+Create Date: 2026-10-17 11:26:05.117342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9da718a90b3'
+down_revision: Union[str, None] = 'c61e6009b0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_imports',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('format', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('inserted_rows', sa.Integer(), nullable=False),
+    sa.Column('error_rows', sa.Integer(), nullable=False),
+    sa.Column('message', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('product_import_errors',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('import_id', sa.Uuid(), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('message', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('raw', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.ForeignKeyConstraint(['import_id'], ['product_imports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_import_errors_import_id'), 'product_import_errors', ['import_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_import_errors_import_id'), table_name='product_import_errors')
+    op.drop_table('product_import_errors')
+    op.drop_table('product_imports')
@@ -0,0 +1,42 @@
+"""product ratings
+
+Revision ID: f4c1b8e3d972
+Revises: d83c6f27a9e5
+Create Date: 2026-10-17 17:31:45.218390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c1b8e3d972'
+down_revision: Union[str, None] = 'd83c6f27a9e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ['review_count', 'rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+
+
+def upgrade() -> None:
+    op.create_table('product_ratings',
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    *[sa.Column(name, sa.Integer(), server_default='0', nullable=False) for name in COUNTERS],
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.execute("""
+        INSERT INTO product_ratings (product_id, review_count, rating_sum,
+                                     rating_1, rating_2, rating_3, rating_4, rating_5)
+        SELECT product_id, count(*), sum(rating),
+               count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5)
+        FROM reviews GROUP BY product_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('product_ratings')
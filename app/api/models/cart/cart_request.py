@@ -1,12 +1,16 @@
+import uuid
 from typing import Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Field
+
+# 4 bound parameters per row in the one multi-row upsert, under asyncpg's 32767 parameter limit
+CART_CHANGES_LIMIT = 5000
 
 
 class AddToCart(SQLModel):
     user_id: Optional[str] = ""
     product_id: str
-    quantity: int
+    quantity: int = Field(gt=0)
 
 class RemoveFromCart(SQLModel):
     cart_id: str
@@ -14,3 +18,9 @@ class RemoveFromCart(SQLModel):
 
 class UpdateCartQuantity(SQLModel):
     quantity: int
+
+
+class CartQuantityChange(SQLModel):
+    """New absolute quantity of a product in the cart; 0 removes it"""
+    product_id: uuid.UUID
+    quantity: int = Field(ge=0)
@@ -0,0 +1,17 @@
+from typing import List
+
+from sqlmodel import SQLModel
+
+from app.api.models.products.product_response import ProductCard
+
+
+class CartLine(SQLModel):
+    product: ProductCard
+    quantity: int
+    line_total: float
+
+
+class CartSummary(SQLModel):
+    items: List[CartLine] = []
+    subtotal: float = 0
+    item_count: int = 0
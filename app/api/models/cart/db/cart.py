@@ -1,17 +1,20 @@
 import uuid
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class Cart(SQLModel, table=True):
-    id: uuid.UUID = Field(default=uuid.uuid4(), primary_key=True)
+    # one row per product in a user's cart; adding again increments the quantity (see add_to_cart_service)
+    __table_args__ = (UniqueConstraint("user_id", "product_id", name="uq_cart_user_id_product_id"),)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="User.id")
-    product_id: uuid.UUID = Field(foreign_key="products.id")
+    product_id: uuid.UUID = Field(foreign_key="products.id", ondelete="CASCADE")
     quantity: int
 
-    product: Optional["Product"] = Relationship(back_populates="cart", sa_relationship_kwargs={"lazy": "selectin"})
-    user: Optional["User"] = Relationship(back_populates="cart", sa_relationship_kwargs={"lazy": "selectin"})
+    product: Optional["Product"] = Relationship(back_populates="cart")
+    user: Optional["User"] = Relationship(back_populates="cart")
 
 
 # from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Numeric, func
@@ -0,0 +1 @@
+from app.api.models.orders.db.order import Order, OrderItem
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field, Relationship
+
+
+class OrderStatus(str, Enum):
+    placed = "placed"
+    cancelled = "cancelled"
+
+
+class Order(SQLModel, table=True):
+    __tablename__ = "orders"
+    __table_args__ = (Index("ix_orders_user_id_created_at_id", "user_id", "created_at", "id"),)
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    user_id: uuid.UUID = Field(foreign_key="User.id")
+    status: str = Field(default=OrderStatus.placed.value)
+    total: float
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    items: List["OrderItem"] = Relationship(back_populates="order")
+
+
+class OrderItem(SQLModel, table=True):
+    """One line per product and warehouse the stock was taken from, with the price paid"""
+    __tablename__ = "order_items"
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    order_id: uuid.UUID = Field(foreign_key="orders.id", index=True)
+    product_id: uuid.UUID = Field(foreign_key="products.id")
+    warehouse_id: uuid.UUID = Field(foreign_key="warehouses.id")
+    quantity: int
+    unit_price: float
+
+    order: Optional["Order"] = Relationship(back_populates="items")
@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlmodel import SQLModel
+
+
+class OrderItemRead(SQLModel):
+    id: uuid.UUID
+    product_id: uuid.UUID
+    warehouse_id: uuid.UUID
+    quantity: int
+    unit_price: float
+
+
+class OrderRead(SQLModel):
+    id: uuid.UUID
+    status: str
+    total: float
+    created_at: datetime
+    items: List[OrderItemRead] = []
@@ -4,4 +4,8 @@ from app.api.models.products.db.product_category import ProductCategory
 from app.api.models.products.db.warehouse import Warehouse
 from app.api.models.products.db.product_image import ProductImage
 from app.api.models.products.db.inventory import Inventory
-from app.api.models.cart.db.cart import Cart
\ No newline at end of file
+from app.api.models.products.db.product_stock import ProductStock
+from app.api.models.products.db.product_rating import ProductRating
+from app.api.models.products.db.inventory_sync import InventorySync
+from app.api.models.cart.db.cart import Cart
+from app.api.models.products.db.product_import import ProductImport, ProductImportError
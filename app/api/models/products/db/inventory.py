@@ -1,15 +1,17 @@
 import uuid
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import SQLModel, Field, Relationship
 
 class Inventory(SQLModel, table=True):
     __tablename__ = "inventories"
+    __table_args__ = (UniqueConstraint("product_id", "warehouse_id", name="uq_inventories_product_id_warehouse_id"),)
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    product_id: uuid.UUID = Field(foreign_key="products.id")
+    product_id: uuid.UUID = Field(foreign_key="products.id", ondelete="CASCADE")
     warehouse_id: uuid.UUID = Field(foreign_key="warehouses.id")
     quantity: int
 
 
-    product: Optional["Product"] = Relationship(back_populates="inventories",sa_relationship_kwargs={"lazy": "selectin"})
-    warehouse: Optional["Warehouse"] = Relationship(back_populates="inventories",sa_relationship_kwargs={"lazy": "selectin"})
\ No newline at end of file
+    product: Optional["Product"] = Relationship(back_populates="inventories")
+    warehouse: Optional["Warehouse"] = Relationship(back_populates="inventories")
\ No newline at end of file
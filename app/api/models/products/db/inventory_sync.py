@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field
+
+
+class InventorySync(SQLModel, table=True):
+    """A processed adjustment batch, so a retried sync returns its original results instead of applying twice"""
+    __tablename__ = "inventory_syncs"
+    sync_id: str = Field(primary_key=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    results: Optional[List[dict]] = Field(default=None, sa_column=Column(JSONB))
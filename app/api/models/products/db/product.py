@@ -1,19 +1,31 @@
 import uuid
+from datetime import datetime
 from typing import List, Optional
 
+from sqlalchemy import Column, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import SQLModel, Field, Relationship
 
 
 class Product(SQLModel, table=True):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     name: str
     description: Optional[str] = None
     price: float
     category_id: int = Field(foreign_key="product_categories.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"server_default": func.now()})
+    # weighted name/description document, kept current by the products_search_vector_update trigger
+    search_vector: Optional[str] = Field(default=None, exclude=True, sa_column=Column(TSVECTOR))
 
-    category: Optional["ProductCategory"] = Relationship(back_populates="products", sa_relationship_kwargs={"lazy": "selectin"})
-    images: List["ProductImage"] = Relationship(back_populates="product", sa_relationship_kwargs={"lazy": "selectin"})
-    reviews: List["Review"] = Relationship(back_populates="product", sa_relationship_kwargs={"lazy": "selectin"})
-    inventories: List["Inventory"] = Relationship(back_populates="product", sa_relationship_kwargs={"lazy": "selectin"})
-    cart: List["Cart"] = Relationship(back_populates="product", sa_relationship_kwargs={"lazy": "selectin"})
\ No newline at end of file
+    category: Optional["ProductCategory"] = Relationship(back_populates="products")
+    # child rows are removed by ON DELETE CASCADE, so deleting a product never loads them
+    images: List["ProductImage"] = Relationship(back_populates="product", passive_deletes="all")
+    reviews: List["Review"] = Relationship(back_populates="product", passive_deletes="all")
+    inventories: List["Inventory"] = Relationship(back_populates="product", passive_deletes="all")
+    cart: List["Cart"] = Relationship(back_populates="product", passive_deletes="all")
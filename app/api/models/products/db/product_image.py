@@ -7,9 +7,9 @@ from sqlmodel import SQLModel, Field, Relationship
 class ProductImage(SQLModel, table=True):
     __tablename__ = "product_images"
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    product_id: uuid.UUID = Field(foreign_key="products.id")
+    product_id: uuid.UUID = Field(foreign_key="products.id", ondelete="CASCADE")
     image: str
     primary_image: bool = Field(default=False)
 
 
-    product: Optional["Product"] = Relationship(back_populates="images",sa_relationship_kwargs={"lazy": "selectin"})
\ No newline at end of file
+    product: Optional["Product"] = Relationship(back_populates="images")
\ No newline at end of file
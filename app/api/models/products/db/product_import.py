@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class ImportStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ProductImport(SQLModel, table=True):
+    __tablename__ = "product_imports"
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    format: str
+    status: str = Field(default=ImportStatus.pending.value)
+    processed_rows: int = Field(default=0)
+    inserted_rows: int = Field(default=0)
+    error_rows: int = Field(default=0)
+    message: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+
+class ProductImportError(SQLModel, table=True):
+    __tablename__ = "product_import_errors"
+    id: Optional[int] = Field(default=None, primary_key=True, sa_column_kwargs={'autoincrement': True})
+    import_id: uuid.UUID = Field(foreign_key="product_imports.id", index=True)
+    row_number: int
+    message: str
+    raw: Optional[str] = None
@@ -0,0 +1,19 @@
+import uuid
+
+from sqlmodel import SQLModel, Field
+
+
+class ProductRating(SQLModel, table=True):
+    """
+    Review totals per product with a 1-5 histogram, updated by the review services
+    in the same transaction as the review itself
+    """
+    __tablename__ = "product_ratings"
+    product_id: uuid.UUID = Field(primary_key=True, foreign_key="products.id", ondelete="CASCADE")
+    review_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+    rating_1: int = Field(default=0)
+    rating_2: int = Field(default=0)
+    rating_3: int = Field(default=0)
+    rating_4: int = Field(default=0)
+    rating_5: int = Field(default=0)
@@ -1,18 +1,26 @@
 import uuid
+from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index, func
 from sqlmodel import SQLModel, Field, Relationship
 
 
 
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    # keyset feeds per product, newest first or highest rated first
+    __table_args__ = (
+        Index("ix_reviews_product_id_created_at_id", "product_id", "created_at", "id"),
+        Index("ix_reviews_product_id_rating_created_at_id", "product_id", "rating", "created_at", "id"),
+    )
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    product_id: uuid.UUID = Field(foreign_key="products.id")
+    product_id: uuid.UUID = Field(foreign_key="products.id", ondelete="CASCADE")
     reviewer_id: uuid.UUID = Field(foreign_key="User.id")
     rating: int
     review_message: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"server_default": func.now()})
 
 
-    product: Optional["Product"] = Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "selectin"})
-    reviewer: Optional["User"] = Relationship(back_populates="reviews",sa_relationship_kwargs={"lazy": "selectin"})
\ No newline at end of file
+    product: Optional["Product"] = Relationship(back_populates="reviews")
+    reviewer: Optional["User"] = Relationship(back_populates="reviews")
\ No newline at end of file
@@ -0,0 +1,13 @@
+import uuid
+
+from sqlmodel import SQLModel, Field
+
+
+class ProductStock(SQLModel, table=True):
+    """
+    Units available per product across all warehouses. Read-only for the application:
+    the inventories_product_stock trigger applies every inventory change as a delta.
+    """
+    __tablename__ = "product_stock"
+    product_id: uuid.UUID = Field(primary_key=True, foreign_key="products.id", ondelete="CASCADE")
+    quantity: int = Field(default=0)
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 
 from sqlmodel import SQLModel
@@ -13,4 +14,14 @@ class ProductUpdate(SQLModel):
     name: Optional[str] = None
     description: Optional[str] = None
     price: Optional[float] = None
-    category_id: Optional[int] = None
\ No newline at end of file
+    category_id: Optional[int] = None
+
+
+class CatalogFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ReviewOrder(str, Enum):
+    newest = "newest"
+    rating = "rating"
\ No newline at end of file
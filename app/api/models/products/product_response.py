@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlmodel import SQLModel
+
+
+class CategoryRead(SQLModel):
+    id: int
+    name: str
+
+
+class ProductImageRead(SQLModel):
+    id: uuid.UUID
+    product_id: uuid.UUID
+    image: str
+    primary_image: bool
+
+
+class ProductRead(SQLModel):
+    id: uuid.UUID
+    name: str
+    description: Optional[str] = None
+    price: float
+    category_id: int
+
+
+class ProductDetail(ProductRead):
+    category: Optional[CategoryRead] = None
+    images: List[ProductImageRead] = []
+
+
+class ProductCard(SQLModel):
+    id: uuid.UUID
+    name: str
+    price: float
+    category_name: Optional[str] = None
+    image: Optional[str] = None
+    average_rating: Optional[float] = None
+    review_count: int = 0
+    in_stock: bool = False
+
+
+class ProductRatingRead(SQLModel):
+    product_id: uuid.UUID
+    review_count: int = 0
+    average_rating: Optional[float] = None
+    histogram: Dict[int, int] = {}
+
+
+class ProductReviewRead(SQLModel):
+    id: uuid.UUID
+    rating: int
+    review_message: Optional[str] = None
+    created_at: datetime
+    reviewer_id: uuid.UUID
+    reviewer_name: str
+
+
+class ProductAvailability(SQLModel):
+    product_id: uuid.UUID
+    quantity: int
+    in_stock: bool
+
+
+class ProductSearchHit(ProductCard):
+    relevance: float
+    snippet: Optional[str] = None
@@ -8,4 +8,4 @@ class Session(SQLModel, table=True):
     user_id: uuid.UUID = Field(foreign_key="User.id")
     session_token: str = Field(unique=True)
 
-    user: "User" = Relationship(back_populates="session", sa_relationship_kwargs={"lazy": "selectin"})
\ No newline at end of file
+    user: "User" = Relationship(back_populates="session")
\ No newline at end of file
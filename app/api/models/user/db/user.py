@@ -4,7 +4,6 @@ from typing import List
 from sqlmodel import SQLModel, Field, Relationship
 
 from app.api.models.user.signup_request import SignUpRequest
-from app.api.utils.password_utils import get_hashed_password
 
 
 class User(SQLModel, table=True):
@@ -15,17 +14,17 @@ class User(SQLModel, table=True):
     first_name: str = Field(min_length=2, max_length=26, regex=r"^[A-Za-z\\s'-]{1,100}$")
     last_name: str = Field(min_length=2, max_length=26, regex=r"^[A-Za-z\\s'-]{1,100}$")
 
-    session: "Session" = Relationship(back_populates="user", sa_relationship_kwargs={"lazy": "selectin"})
-    reviews: List["Review"] = Relationship(back_populates="reviewer",sa_relationship_kwargs={"lazy": "selectin"})
-    cart: List["Cart"] = Relationship(back_populates="user",sa_relationship_kwargs={"lazy": "selectin"})
+    session: "Session" = Relationship(back_populates="user")
+    reviews: List["Review"] = Relationship(back_populates="reviewer")
+    cart: List["Cart"] = Relationship(back_populates="user")
 
 
 
 
-def to_user(signup_request: SignUpRequest) -> User:
+def to_user(signup_request: SignUpRequest, hashed_password: str) -> User:
     return User(
         email=signup_request.email,
-        hashed_password=get_hashed_password(signup_request.password),
+        hashed_password=hashed_password,
         first_name=signup_request.first_name,
         last_name=signup_request.last_name
     )
\ No newline at end of file
@@ -0,0 +1,10 @@
+import uuid
+from typing import List
+
+from pydantic import BaseModel
+
+
+class Principal(BaseModel):
+    """Authenticated caller as described by verified token claims, without a User row fetch"""
+    id: uuid.UUID
+    roles: List[str] = []
@@ -1,18 +1,22 @@
-from sqlite3 import IntegrityError
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.cart.cart_request import AddToCart, UpdateCartQuantity
+from app.api.models.cart.cart_request import AddToCart, UpdateCartQuantity, CartQuantityChange, CART_CHANGES_LIMIT
+from app.api.models.cart.cart_response import CartSummary
 from app.api.models.cart.db.cart import Cart
-from app.api.models.products import Product
-from app.api.routes.user.user_service import get_current_user
+from app.api.models.products.product_response import ProductRead
+from app.api.routes.user.user_service import get_current_principal
 from app.api.services.cart_service import add_to_cart_service, remove_from_cart_service, \
-    increase_cart_product_quantity_service, get_cart_service
+    increase_cart_product_quantity_service, get_cart_service, update_cart_service, \
+    get_cart_summary_service
+from app.api.utils.responses import model_response
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-cart_router = APIRouter(prefix="/cart", tags=["cart"])
+cart_router = APIRouter(prefix="/cart", tags=["cart"], dependencies=[Depends(QueryBudget(5))])
 
 
 # @cart_router.post("/add", response_model=List[], status_code=201)
@@ -32,9 +36,10 @@ cart_router = APIRouter(prefix="/cart", tags=["cart"])
 
 
 @cart_router.post("/", response_model=Cart, status_code=201)
-async def add_to_cart(request: AddToCart, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+async def add_to_cart(request: AddToCart, db: AsyncSession = Depends(get_db),
+                      principal=Depends(get_current_principal)):
     try:
-        request.user_id = user.id
+        request.user_id = principal.id
         result = await add_to_cart_service(db, request)
         print("cart added", result)
         return result
@@ -46,8 +51,20 @@ async def add_to_cart(request: AddToCart, db: AsyncSession = Depends(get_db), us
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@cart_router.patch("/", response_model=List[Cart])
+async def update_cart(changes: List[CartQuantityChange] = Body(max_length=CART_CHANGES_LIMIT),
+                      db: AsyncSession = Depends(get_db), principal=Depends(get_current_principal)):
+    try:
+        return await update_cart_service(db, principal.id, changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @cart_router.delete("/{cart_id}", status_code=204)
-async def delete_product(cart_id: str, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+async def delete_product(cart_id: str, db: AsyncSession = Depends(get_db),
+                         principal=Depends(get_current_principal)):
     try:
         if await remove_from_cart_service(db, cart_id) is None:
             raise HTTPException(status_code=404, detail="Cart Item not found")
@@ -58,7 +75,7 @@ async def delete_product(cart_id: str, db: AsyncSession = Depends(get_db), user=
 
 @cart_router.put("/{cart_id}", response_model=Cart)
 async def update_product(cart_id: str, cart_update: UpdateCartQuantity, db: AsyncSession = Depends(get_db),
-                         user=Depends(get_current_user)):
+                         principal=Depends(get_current_principal)):
     try:
         cart = await increase_cart_product_quantity_service(db, cart_update, cart_id)
         if cart is None:
@@ -70,11 +87,14 @@ async def update_product(cart_id: str, cart_update: UpdateCartQuantity, db: Asyn
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@cart_router.get("/", response_model=List[Product], status_code=200)
-async def get_cart(db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+@cart_router.get("/", response_model=List[ProductRead], status_code=200)
+async def get_cart(db: AsyncSession = Depends(get_db), principal=Depends(get_current_principal)):
     try:
-        result = await get_cart_service(db, user.id)
-        price = sum(i.price for i in result)
-        return result
+        return await get_cart_service(db, principal.id)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+
+
+@cart_router.get("/summary", response_model=CartSummary, status_code=200, dependencies=[Depends(QueryBudget(1))])
+async def get_cart_summary(db: AsyncSession = Depends(get_db), principal=Depends(get_current_principal)):
+    return model_response(await get_cart_summary_service(db, principal.id))
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.models.orders.order_response import OrderRead
+from app.api.routes.user.user_service import get_current_principal
+from app.api.services.order_service import checkout_service, get_order_service, get_orders_service
+from app.api.utils.pagination import Page
+from app.core.db import get_db
+from app.core.query_budget import QueryBudget
+
+order_router = APIRouter(prefix="/orders", tags=["Orders"], dependencies=[Depends(QueryBudget(5))])
+
+
+# set-based whatever the cart size; one extra lock round per additional warehouse a line is split over
+@order_router.post("/checkout", response_model=OrderRead, status_code=201,
+                   dependencies=[Depends(QueryBudget(20))])
+async def checkout(db: AsyncSession = Depends(get_db), principal=Depends(get_current_principal)):
+    try:
+        return await checkout_service(db, principal.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@order_router.get("/", response_model=Page[OrderRead])
+async def read_orders(cursor: Optional[str] = None, limit: int = Query(20, ge=1, le=100),
+                      db: AsyncSession = Depends(get_db),
+                      principal=Depends(get_current_principal)):
+    try:
+        return await get_orders_service(db, principal.id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@order_router.get("/{order_id}", response_model=OrderRead)
+async def read_order(order_id: str, db: AsyncSession = Depends(get_db), principal=Depends(get_current_principal)):
+    order = await get_order_service(db, principal.id, order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
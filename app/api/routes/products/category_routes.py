@@ -5,14 +5,16 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api.models.products import ProductCategory
 from app.api.models.products.category_request import CategoryCreate
 from app.api.services.category_service import create_category_service, delete_category_service
-from app.api.routes.user.user_service import get_current_user
+from app.api.routes.user.user_service import get_current_principal
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-category_router = APIRouter(prefix="/category", tags=["Category"])
+category_router = APIRouter(prefix="/category", tags=["Category"], dependencies=[Depends(QueryBudget(5))])
 
 
 @category_router.post("/create", response_model=ProductCategory, status_code=201)
-async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_db),
+                          principal=Depends(get_current_principal)):
     try:
         result = await create_category_service(category=category, db=db)
         print(result)
@@ -25,8 +27,11 @@ async def create_category(category: CategoryCreate, db: AsyncSession = Depends(g
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@category_router.delete("/delete", response_model=ProductCategory, status_code=403)
-async def delete_category(category_id: str, db: AsyncSession = Depends(get_db)):
-    if await delete_category_service(category_id, db) is None:
-        raise HTTPException(status_code=404, detail="Inventory not found")
+@category_router.delete("/delete", status_code=204)
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_db)):
+    try:
+        if await delete_category_service(category_id, db) is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Category has products and cannot be deleted")
     return None
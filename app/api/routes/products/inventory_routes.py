@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+import uuid
 
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+
+from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import Inventory
+from app.api.models.products.product_response import ProductAvailability
 from app.api.services.Inventory_service import InventoryCreate, create_inventory_service, get_inventory_service, \
-    get_inventories_service, update_inventory_service, delete_inventory_service, InventoryUpdate
+    get_inventories_service, update_inventory_service, delete_inventory_service, InventoryUpdate, \
+    get_availability_service, InventoryAdjustmentBatch, InventoryAdjustmentResponse, adjust_inventory_service
+from app.api.utils.pagination import Page
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-inventory_router = APIRouter(prefix="/inventory", tags=["Inventory"])
+inventory_router = APIRouter(prefix="/inventory", tags=["Inventory"], dependencies=[Depends(QueryBudget(5))])
 
 @inventory_router.post("/", response_model=Inventory, status_code=201)
 async def create_inventory(inventory: InventoryCreate, db: AsyncSession = Depends(get_db)):
@@ -16,22 +23,40 @@ async def create_inventory(inventory: InventoryCreate, db: AsyncSession = Depend
         return await create_inventory_service(db, inventory)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Inventory for this product and warehouse already exists")
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# sync claim, row locks, update, insert, stored results, product_stock locks
+@inventory_router.post("/adjustments", response_model=InventoryAdjustmentResponse,
+                       dependencies=[Depends(QueryBudget(6))])
+async def adjust_inventory(batch: InventoryAdjustmentBatch, db: AsyncSession = Depends(get_db)):
+    return await adjust_inventory_service(db, batch)
+
+@inventory_router.get("/availability", response_model=List[ProductAvailability])
+async def read_availability(product_ids: List[uuid.UUID] = Query(..., max_length=500),
+                            db: AsyncSession = Depends(get_db)):
+    return await get_availability_service(db, product_ids)
+
 @inventory_router.get("/{inventory_id}", response_model=Inventory)
-async def read_inventory(inventory_id: int, db: AsyncSession = Depends(get_db)):
+async def read_inventory(inventory_id: str, db: AsyncSession = Depends(get_db)):
     inventory = await get_inventory_service(db, inventory_id)
     if inventory is None:
         raise HTTPException(status_code=404, detail="Inventory not found")
     return inventory
 
-@inventory_router.get("/", response_model=List[Inventory])
-async def read_inventories(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return get_inventories_service(db, skip=skip, limit=limit)
+@inventory_router.get("/", response_model=Page[Inventory])
+async def read_inventories(cursor: Optional[str] = None, skip: int = Query(0, ge=0, deprecated=True),
+                           limit: int = Query(100, ge=1, le=500),
+                           db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_inventories_service(db, cursor=cursor, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @inventory_router.put("/{inventory_id}", response_model=Inventory)
-async def update_inventory(inventory_id: int, inventory_update: InventoryUpdate, db: AsyncSession = Depends(get_db)):
+async def update_inventory(inventory_id: str, inventory_update: InventoryUpdate, db: AsyncSession = Depends(get_db)):
     try:
         inventory = await update_inventory_service(db, inventory_id, inventory_update)
         if inventory is None:
@@ -43,7 +68,7 @@ async def update_inventory(inventory_id: int, inventory_update: InventoryUpdate,
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @inventory_router.delete("/{inventory_id}", status_code=204)
-async def delete_inventory(inventory_id: int, db: AsyncSession = Depends(get_db)):
+async def delete_inventory(inventory_id: str, db: AsyncSession = Depends(get_db)):
     if await delete_inventory_service(db, inventory_id) is None:
         raise HTTPException(status_code=404, detail="Inventory not found")
     return None
\ No newline at end of file
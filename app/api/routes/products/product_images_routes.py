@@ -1,15 +1,19 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import ProductImage
 from app.api.services.product_image_service import ProductImageCreate, create_product_image_service, \
     get_product_image_service, get_product_images_service, update_product_image_service, delete_product_image_service, \
     ProductImageUpdate
+from app.api.utils.etag import conditional_response
+from app.api.utils.pagination import Page
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-product_images_router = APIRouter(prefix="/product-images", tags=["Product Images"])
+product_images_router = APIRouter(prefix="/product-images", tags=["Product Images"],
+                                   dependencies=[Depends(QueryBudget(5))])
 
 
 @product_images_router.post("/", response_model=ProductImage, status_code=201)
@@ -23,16 +27,22 @@ async def create_product_image(image: ProductImageCreate, db: AsyncSession = Dep
 
 
 @product_images_router.get("/{image_id}", response_model=ProductImage)
-async def read_product_image(image_id: str, db: AsyncSession = Depends(get_db)):
+async def read_product_image(image_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     image = await get_product_image_service(db, image_id)
     if image is None:
         raise HTTPException(status_code=404, detail="Product image not found")
-    return image
+    image, etag = image
+    return conditional_response(request, image, etag=etag)
 
 
-@product_images_router.get("/", response_model=List[ProductImage])
-async def read_product_images(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await get_product_images_service(db, skip=skip, limit=limit)
+@product_images_router.get("/", response_model=Page[ProductImage])
+async def read_product_images(cursor: Optional[str] = None, skip: int = Query(0, ge=0, deprecated=True),
+                              limit: int = Query(100, ge=1, le=500),
+                              db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_product_images_service(db, cursor=cursor, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @product_images_router.put("/{image_id}", response_model=ProductImage)
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.models.products import ProductImport, ProductImportError
+from app.api.models.products.product_request import CatalogFormat
+from app.api.routes.user.user_service import get_current_principal
+from app.api.services.product_import_service import create_product_import_service, run_product_import, \
+    get_product_import_service, get_product_import_errors_service
+from app.api.utils.pagination import Page
+from app.core.config import Config
+from app.core.db import get_db
+from app.core.query_budget import QueryBudget
+
+product_import_router = APIRouter(prefix="/products/imports", tags=["Product Imports"],
+                                   dependencies=[Depends(QueryBudget(5))])
+
+
+def _body_too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Import body exceeds {Config.PRODUCT_IMPORT_MAX_BYTES} bytes")
+
+
+async def _spool_request_body(request: Request, suffix: str) -> str:
+    """
+    Writes the request body to a temporary file chunk by chunk, with the file writes on a worker
+    thread, and returns its path. The file is removed if the body turns out too large or the
+    client disconnects midway.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    size = 0
+    try:
+        async with await anyio.open_file(path, "wb") as spool:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > Config.PRODUCT_IMPORT_MAX_BYTES:
+                    raise _body_too_large()
+                await spool.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+@product_import_router.post("/", response_model=ProductImport, status_code=202)
+async def import_products(request: Request, background_tasks: BackgroundTasks,
+                          format: CatalogFormat = CatalogFormat.ndjson, db: AsyncSession = Depends(get_db),
+                          principal=Depends(get_current_principal)):
+    """
+    Takes the raw CSV/NDJSON request body, up to PRODUCT_IMPORT_MAX_BYTES. The body is spooled to a
+    temporary file chunk by chunk, never held in memory, and the import itself runs in the background;
+    poll the returned id for progress.
+    """
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > Config.PRODUCT_IMPORT_MAX_BYTES:
+        raise _body_too_large()
+    path = await _spool_request_body(request, suffix=f".{format.value}")
+    try:
+        job = await create_product_import_service(db, format)
+    except BaseException:
+        # the background task removes the file once it owns it
+        os.remove(path)
+        raise
+    background_tasks.add_task(run_product_import, job.id, path, format, remove_source=True)
+    return job
+
+
+@product_import_router.get("/{import_id}", response_model=ProductImport)
+async def read_product_import(import_id: str, db: AsyncSession = Depends(get_db)):
+    job = await get_product_import_service(db, import_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+
+@product_import_router.get("/{import_id}/errors", response_model=Page[ProductImportError])
+async def read_product_import_errors(import_id: str, cursor: Optional[str] = None,
+                                     limit: int = Query(100, ge=1, le=500), db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_product_import_errors_service(db, import_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,31 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.products.db.product import Product
-from app.api.models.products.product_request import ProductCreate, ProductUpdate
-from app.api.services.product_service import create_product_service, \
+from app.api.models.products.product_request import ProductCreate, ProductUpdate, CatalogFormat, ReviewOrder
+from app.api.models.products.product_response import ProductRead, ProductDetail, ProductCard, ProductSearchHit, \
+    ProductRatingRead, ProductReviewRead
+from app.api.services.product_service import create_products_service, \
     get_product_service, get_products_service, update_product_service, delete_product_service, \
-    get_products_by_name_service
-from app.api.routes.user.user_service import get_current_user
+    get_products_by_name_service, stream_products_export_service
+from app.api.services.review_service import get_product_rating_service, get_product_reviews_service
+from app.api.routes.user.user_service import get_current_principal
+from app.api.utils.etag import conditional_response
+from app.api.utils.fieldsets import parse_fields, page_include
+from app.api.utils.pagination import Page
+from app.api.utils.responses import model_response
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-product_router = APIRouter(prefix="/products", tags=["Products"])
+product_router = APIRouter(prefix="/products", tags=["Products"], dependencies=[Depends(QueryBudget(5))])
 
 """
 Note : Will add role like merchant and customer
 """
 
 
-@product_router.post("/", response_model=List[Product], status_code=201)
-async def create_product(product: List[ProductCreate], db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
+@product_router.post("/", response_model=List[ProductRead], status_code=201)
+async def create_product(product: List[ProductCreate], db: AsyncSession = Depends(get_db),
+                         principal=Depends(get_current_principal)):
     try:
-        result=[]
-        for i in product:
-            p = await create_product_service(db, i)
-            result.append(p)
-        return result
+        return await create_products_service(db, product)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except IntegrityError:
@@ -34,12 +39,53 @@ async def create_product(product: List[ProductCreate], db: AsyncSession = Depend
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@product_router.get("/{product_id}", response_model=Product)
-async def read_product(product_id: str, db: AsyncSession = Depends(get_db)):
-    product = await get_product_service(db, product_id)
+EXPORT_MEDIA_TYPES = {
+    CatalogFormat.ndjson: "application/x-ndjson",
+    CatalogFormat.csv: "text/csv",
+}
+
+
+@product_router.get("/export")
+async def export_products(format: CatalogFormat = CatalogFormat.ndjson):
+    return StreamingResponse(
+        stream_products_export_service(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format.value}"'},
+    )
+
+
+@product_router.get("/{product_id}", response_model=ProductDetail)
+async def read_product(product_id: str, request: Request, fields: Optional[str] = None,
+                       db: AsyncSession = Depends(get_db)):
+    try:
+        fields = parse_fields(fields, ProductDetail.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    product = await get_product_service(db, product_id, fields=fields)
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    detail, etag = product
+    return conditional_response(request, detail, etag=etag if fields is None else None, include=fields)
+
+
+@product_router.get("/{product_id}/rating", response_model=ProductRatingRead)
+async def read_product_rating(product_id: str, db: AsyncSession = Depends(get_db)):
+    rating = await get_product_rating_service(db, product_id)
+    if rating is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return rating
+
+
+@product_router.get("/{product_id}/reviews", response_model=Page[ProductReviewRead])
+async def read_product_reviews(product_id: str, order: ReviewOrder = ReviewOrder.newest, cursor: Optional[str] = None,
+                               limit: int = Query(20, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+    try:
+        reviews = await get_product_reviews_service(db, product_id, order=order, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if reviews is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return model_response(reviews)
 
 
 """
@@ -47,21 +93,36 @@ Note:for performance only returning the primary image and minimal details
 """
 
 
-@product_router.get("/", response_model=List[Product])
-async def read_products(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await get_products_service(db, skip=skip, limit=limit)
+@product_router.get("/", response_model=Page[ProductCard])
+async def read_products(request: Request, cursor: Optional[str] = None, skip: int = Query(0, ge=0, deprecated=True),
+                        limit: int = Query(100, ge=1, le=500), fields: Optional[str] = None,
+                        db: AsyncSession = Depends(get_db)):
+    try:
+        fields = parse_fields(fields, ProductCard.model_fields)
+        page, etag = await get_products_service(db, cursor=cursor, skip=skip, limit=limit, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return conditional_response(request, page, etag=etag, include=page_include(fields))
 
 
-@product_router.get("/name/", response_model=List[Product])
-async def read_products_by_name(name: str, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await get_products_by_name_service(db, skip=skip, limit=limit, name_filter=name)
+@product_router.get("/name/", response_model=Page[ProductSearchHit])
+async def read_products_by_name(name: str, cursor: Optional[str] = None, skip: int = Query(0, ge=0, deprecated=True),
+                                limit: int = Query(100, ge=1, le=500), fields: Optional[str] = None,
+                                db: AsyncSession = Depends(get_db)):
+    try:
+        fields = parse_fields(fields, ProductSearchHit.model_fields)
+        page = await get_products_by_name_service(db, cursor=cursor, skip=skip, limit=limit, name_filter=name,
+                                                  fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return model_response(page, include=page_include(fields))
 
 
-@product_router.put("/{product_id}", response_model=Product)
+@product_router.put("/{product_id}", response_model=ProductRead)
 async def update_product(product_id: str, product_update: ProductUpdate, db: AsyncSession = Depends(get_db),
-                         user=Depends(get_current_user)):
+                         principal=Depends(get_current_principal)):
     try:
-        product = update_product_service(db, product_id, product_update)
+        product = await update_product_service(db, product_id, product_update)
         if product is None:
             raise HTTPException(status_code=404, detail="Product not found")
         return product
@@ -74,7 +135,11 @@ async def update_product(product_id: str, product_update: ProductUpdate, db: Asy
 
 
 @product_router.delete("/{product_id}", status_code=204)
-async def delete_product(product_id: int, db: AsyncSession = Depends(get_db), user=Depends(get_current_user)):
-    if delete_product_service(db, product_id) is None:
-        raise HTTPException(status_code=404, detail="Product not found")
+async def delete_product(product_id: str, db: AsyncSession = Depends(get_db),
+                         principal=Depends(get_current_principal)):
+    try:
+        if await delete_product_service(db, product_id) is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Product has orders and cannot be deleted")
     return None
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import Session
-from typing import List
 
 from app.api.models.products import Review
 from app.api.services.review_service import ReviewCreate, create_review_service, \
     get_review_service, update_review_service, delete_review_service, ReviewUpdate
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-reviews_router = APIRouter(prefix="/reviews", tags=["Reviews"])
+reviews_router = APIRouter(prefix="/reviews", tags=["Reviews"], dependencies=[Depends(QueryBudget(5))])
 
 @reviews_router.post("/", response_model=Review, status_code=201)
 async def create_review(review: ReviewCreate, db: AsyncSession = Depends(get_db)):
@@ -21,19 +21,16 @@ async def create_review(review: ReviewCreate, db: AsyncSession = Depends(get_db)
 
 @reviews_router.get("/{review_id}", response_model=Review)
 async def read_review(review_id: str, db: AsyncSession = Depends(get_db)):
-    review = get_review_service(db, review_id)
+    review = await get_review_service(db, review_id)
     if review is None:
         raise HTTPException(status_code=404, detail="Review not found")
     return review
 
-# @reviews_router.get("/", response_model=List[Review])
-# async def read_reviews(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-#     return get_reviews_service(db, skip=skip, limit=limit)
-
-@reviews_router.put("/{review_id}", response_model=Review)
+# locked read, product and reviewer checks, the update, both rating rows when it moves, the refresh
+@reviews_router.put("/{review_id}", response_model=Review, dependencies=[Depends(QueryBudget(7))])
 async def update_review(review_id: str, review_update: ReviewUpdate, db: AsyncSession = Depends(get_db)):
     try:
-        review = update_review_service(db, review_id, review_update)
+        review = await update_review_service(db, review_id, review_update)
         if review is None:
             raise HTTPException(status_code=404, detail="Review not found")
         return review
@@ -44,6 +41,6 @@ async def update_review(review_id: str, review_update: ReviewUpdate, db: AsyncSe
 
 @reviews_router.delete("/{review_id}", status_code=204)
 async def delete_review(review_id: str, db: AsyncSession = Depends(get_db)):
-    if delete_review_service(db, review_id) is None:
+    if await delete_review_service(db, review_id) is None:
         raise HTTPException(status_code=404, detail="Review not found")
     return None
\ No newline at end of file
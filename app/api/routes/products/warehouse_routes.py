@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
 from sqlalchemy.exc import IntegrityError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import Warehouse
+from app.api.services.allocation_service import AllocationRequest, AllocationResponse, allocate_order_service
 from app.api.services.warehouse_service import WarehouseCreate, create_warehouse_service, \
     delete_warehouse_service, update_warehouse_service, get_warehouses_service, get_warehouse_service, WarehouseUpdate
+from app.api.utils.etag import conditional_response
+from app.api.utils.pagination import Page
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-warehouses_router = APIRouter(prefix="/warehouses", tags=["Warehouses"])
+warehouses_router = APIRouter(prefix="/warehouses", tags=["Warehouses"], dependencies=[Depends(QueryBudget(5))])
 
 @warehouses_router.post("/", response_model=Warehouse, status_code=201)
 async def create_warehouse(warehouse: WarehouseCreate, db: AsyncSession = Depends(get_db)):
@@ -19,16 +23,26 @@ async def create_warehouse(warehouse: WarehouseCreate, db: AsyncSession = Depend
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@warehouses_router.post("/allocate", response_model=AllocationResponse)
+async def allocate_order(request: AllocationRequest, db: AsyncSession = Depends(get_db)):
+    return await allocate_order_service(db, request)
+
 @warehouses_router.get("/{warehouse_id}", response_model=Warehouse)
-async def read_warehouse(warehouse_id: str, db: AsyncSession = Depends(get_db)):
+async def read_warehouse(warehouse_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     warehouse = await get_warehouse_service(db, warehouse_id)
     if warehouse is None:
         raise HTTPException(status_code=404, detail="Warehouse not found")
-    return warehouse
+    warehouse, etag = warehouse
+    return conditional_response(request, warehouse, etag=etag)
 
-@warehouses_router.get("/", response_model=List[Warehouse])
-async def read_warehouses(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await get_warehouses_service(db, skip=skip, limit=limit)
+@warehouses_router.get("/", response_model=Page[Warehouse])
+async def read_warehouses(cursor: Optional[str] = None, skip: int = Query(0, ge=0, deprecated=True),
+                          limit: int = Query(100, ge=1, le=500),
+                          db: AsyncSession = Depends(get_db)):
+    try:
+        return await get_warehouses_service(db, cursor=cursor, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @warehouses_router.put("/{warehouse_id}", response_model=Warehouse)
 async def update_warehouse(warehouse_id: str, warehouse_update: WarehouseUpdate, db: AsyncSession = Depends(get_db)):
@@ -14,8 +14,9 @@ from app.api.utils.password_utils import validate_password, validate_email
 from app.api.utils.token_utils import create_access_token, create_refresh_token
 from app.core.config import Config
 from app.core.db import get_db
+from app.core.query_budget import QueryBudget
 
-user_router = APIRouter()
+user_router = APIRouter(dependencies=[Depends(QueryBudget(5))])
 
 
 @user_router.post("/signup")
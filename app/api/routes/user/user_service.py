@@ -1,18 +1,15 @@
-from datetime import datetime
-
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, HTTPAuthorizationCredentials
-from jose import jwt
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.models.user.db.user import to_user, User
+from app.api.models.user.principal import Principal
 from app.api.models.user.signup_request import SignUpRequest
-from app.api.utils.password_utils import verify_password
+from app.api.utils.password_utils import get_hashed_password_async, verify_and_update_password_async
 from app.core.access_token_barrier import AccessTokenBearer
-from app.core.config import Config
 from app.core.db import get_db
 from app.core.errors import UserNotFound, InvalidCredentials, DataBaseException
 
@@ -20,7 +17,7 @@ access_token_bearer = AccessTokenBearer()
 
 
 async def create_new_user(user: SignUpRequest, db: AsyncSession):
-    db_user = to_user(user)
+    db_user = to_user(user, await get_hashed_password_async(user.password))
     try:
         db.add(db_user)
         await db.commit()
@@ -36,9 +33,12 @@ async def get_user_by_email(email: str, password: str, db: AsyncSession) -> User
         user_db = result.scalars().first()
         if user_db is None:
             raise UserNotFound()
-        verify_user_password = verify_password(password, user_db.hashed_password)
+        verify_user_password, new_hash = await verify_and_update_password_async(password, user_db.hashed_password)
         if not verify_user_password:
             raise InvalidCredentials()
+        if new_hash:
+            user_db.hashed_password = new_hash
+            await db.commit()
         return user_db
     except SQLAlchemyError as e:
         raise DataBaseException(detail=e)
@@ -50,25 +50,23 @@ reuseable_oauth = OAuth2PasswordBearer(
 )
 
 
-async def get_current_user(token_details: HTTPAuthorizationCredentials = Depends(access_token_bearer),
-                           db: AsyncSession = Depends(get_db)):
+async def get_current_principal(request: Request,
+                                token_details: HTTPAuthorizationCredentials = Depends(access_token_bearer)) -> Principal:
+    # signature and expiry were already verified by access_token_bearer
+    claims = request.state.token_claims
     try:
-        print("token_details " + token_details.credentials)
-        payload = jwt.decode(token_details.credentials, Config.JWT_SECRET_KEY, algorithms=Config.ALGORITHM)
-        user_id = payload.get('sub')
-        if datetime.fromtimestamp(payload.get('exp')) < datetime.now():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    except(jwt.JWTError, ValidationError):
+        return Principal(id=claims.get('sub'), roles=claims.get('roles', []))
+    except ValidationError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = await db.get(User, user_id)
+
+
+async def get_current_user(principal: Principal = Depends(get_current_principal), db: AsyncSession = Depends(get_db)):
+    """Loads the full User row, only for routes that need more than the id and roles"""
+    user = await db.get(User, principal.id)
 
     if user is None:
         raise HTTPException(
@@ -1,65 +1,244 @@
-from typing import Optional, List
+import uuid
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
 
-from sqlmodel import SQLModel, Field
+from pydantic import model_validator
+from sqlalchemy import Integer, Uuid, and_, cast, column, func, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel, Field, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.products import Product, Inventory
-from app.api.services.warehouse_service import Warehouse
+from app.api.models.products import Product, Inventory, ProductStock, InventorySync, Warehouse
+from app.api.models.products.product_response import ProductAvailability
+from app.api.services.product_service import invalidate_product_cache
+from app.api.utils.pagination import Keyset, Page
+
+inventory_keyset = Keyset(Inventory.id)
+
+# 5 bound parameters per row in one VALUES list, under asyncpg's 32767 parameter limit
+ADJUSTMENT_BATCH_LIMIT = 5000
 
 
 class InventoryCreate(SQLModel):
-    product_id: int
-    warehouse_id: int
+    product_id: str
+    warehouse_id: str
     quantity: int
 
 class InventoryUpdate(SQLModel):
-    product_id: Optional[int] = None
-    warehouse_id: Optional[int] = None
+    product_id: Optional[str] = None
+    warehouse_id: Optional[str] = None
     quantity: Optional[int] = None
 
+class InventoryAdjustment(SQLModel):
+    """Either a relative `delta` or an absolute `quantity` for one product in one warehouse"""
+    product_id: uuid.UUID
+    warehouse_id: uuid.UUID
+    delta: Optional[int] = None
+    quantity: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def check_delta_or_quantity(self):
+        if (self.delta is None) == (self.quantity is None):
+            raise ValueError("Exactly one of delta or quantity is required")
+        return self
+
+class InventoryAdjustmentBatch(SQLModel):
+    sync_id: Optional[str] = None
+    adjustments: List[InventoryAdjustment] = Field(max_length=ADJUSTMENT_BATCH_LIMIT)
+
+class InventoryAdjustmentResult(SQLModel):
+    product_id: uuid.UUID
+    warehouse_id: uuid.UUID
+    status: str
+    quantity: Optional[int] = None
+    message: Optional[str] = None
+
+class InventoryAdjustmentResponse(SQLModel):
+    sync_id: Optional[str] = None
+    replayed: bool = False
+    results: List[InventoryAdjustmentResult]
+
 # Create
 async def create_inventory_service(db: AsyncSession, inventory: InventoryCreate) -> Inventory:
-    if not db.get(Product, inventory.product_id):
+    if not await db.get(Product, inventory.product_id):
         raise ValueError("Product not found")
-    if not db.get(Warehouse, inventory.warehouse_id):
+    if not await db.get(Warehouse, inventory.warehouse_id):
         raise ValueError("Warehouse not found")
     inventory_model = Inventory(**inventory.dict())
     db.add(inventory_model)
     await db.commit()
+    invalidate_product_cache(inventory.product_id)
     await db.refresh(inventory_model)
     return inventory_model
 
 # Read One
-def get_inventory_service(db: AsyncSession, inventory_id: int) -> Optional[Inventory]:
-    return db.get(Inventory, inventory_id)
+async def get_inventory_service(db: AsyncSession, inventory_id: str) -> Optional[Inventory]:
+    return await db.get(Inventory, inventory_id)
 
 # Read All
-def get_inventories_service(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Inventory]:
-    return db.query(Inventory).offset(skip).limit(limit).all()
+async def get_inventories_service(db: AsyncSession, cursor: Optional[str] = None, skip: int = 0,
+                                  limit: int = 100) -> Page[Inventory]:
+    statement = inventory_keyset.apply(select(Inventory), cursor=cursor, limit=limit, skip=skip)
+    inventories = await db.execute(statement)
+    return inventory_keyset.page(inventories.scalars(), cursor=cursor, limit=limit, skip=skip)
+
+# Availability
+async def get_availability_service(db: AsyncSession, product_ids: List[uuid.UUID]) -> List[ProductAvailability]:
+    """Stock for many products in one primary-key lookup; products without inventory report 0"""
+    product_ids = list(dict.fromkeys(product_ids))
+    rows = await db.execute(
+        select(ProductStock.product_id, ProductStock.quantity).where(ProductStock.product_id.in_(product_ids))
+    )
+    stock = dict(rows.all())
+    return [ProductAvailability(product_id=product_id, quantity=stock.get(product_id, 0),
+                                in_stock=stock.get(product_id, 0) > 0)
+            for product_id in product_ids]
+
+# Batch adjustments
+def _merge_adjustments(adjustments: List[InventoryAdjustment]) -> Dict[Tuple[uuid.UUID, uuid.UUID], Tuple[Optional[int], int]]:
+    """
+    Folds repeated (product, warehouse) entries into one (absolute or None, delta) change, applied in
+    order: an absolute quantity resets the running delta. UPDATE ... FROM would otherwise apply only one.
+    """
+    merged = {}
+    for adjustment in adjustments:
+        key = (adjustment.product_id, adjustment.warehouse_id)
+        absolute, delta = merged.get(key, (None, 0))
+        if adjustment.quantity is not None:
+            merged[key] = (adjustment.quantity, 0)
+        else:
+            merged[key] = (absolute, delta + adjustment.delta)
+    return merged
+
+
+async def adjust_inventory_service(db: AsyncSession, batch: InventoryAdjustmentBatch) -> InventoryAdjustmentResponse:
+    """
+    Applies a whole sync in one transaction with two set-based statements: an UPDATE ... FROM (VALUES ...)
+    for existing rows, then an INSERT ... SELECT for the pairs that have no inventory row yet.
+    A delta that would take stock below zero is rejected for that row only. With a sync_id, a
+    repeated batch returns the stored results of the first run instead of applying again.
+    Inventory rows are locked in (product_id, warehouse_id) order and product_stock rows in product_id
+    order, as checkout does, so overlapping syncs and checkouts cannot deadlock.
+    """
+    if batch.sync_id is not None:
+        claimed = await db.execute(
+            insert(InventorySync)
+            .values(sync_id=batch.sync_id, created_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=[InventorySync.sync_id])
+            .returning(InventorySync.sync_id)
+        )
+        if claimed.first() is None:
+            await db.rollback()
+            sync = await db.get(InventorySync, batch.sync_id)
+            return InventoryAdjustmentResponse(sync_id=batch.sync_id, replayed=True, results=sync.results or [])
+
+    merged = _merge_adjustments(batch.adjustments)
+    keys = sorted(merged)
+    inventories = Inventory.__table__
+    outcomes: Dict[Tuple[uuid.UUID, uuid.UUID], InventoryAdjustmentResult] = {}
+
+    if keys:
+        changes = values(
+            column("idx", Integer), column("product_id", Uuid), column("warehouse_id", Uuid),
+            column("quantity", Integer), column("delta", Integer),
+            name="changes",
+        ).data([(idx, *key, *merged[key]) for idx, key in enumerate(keys)])
+        matches = and_(inventories.c.product_id == changes.c.product_id,
+                       inventories.c.warehouse_id == changes.c.warehouse_id)
+        # the UPDATE takes its row locks in join order, so take them in key order first
+        await db.execute(
+            select(inventories.c.id)
+            .join(changes, matches)
+            .order_by(inventories.c.product_id, inventories.c.warehouse_id)
+            .with_for_update(of=inventories)
+        )
+        # an all-NULL VALUES column is typed text, so a batch of deltas only needs the cast
+        new_quantity = func.coalesce(cast(changes.c.quantity, Integer), inventories.c.quantity) + changes.c.delta
+        updated = await db.execute(
+            update(inventories)
+            .where(matches, new_quantity >= 0)
+            .values(quantity=new_quantity)
+            .returning(changes.c.idx, inventories.c.quantity)
+        )
+        for idx, quantity in updated:
+            outcomes[keys[idx]] = InventoryAdjustmentResult(product_id=keys[idx][0], warehouse_id=keys[idx][1],
+                                                            status="updated", quantity=quantity)
+
+    missing = [key for key in keys if key not in outcomes and (merged[key][0] or 0) + merged[key][1] >= 0]
+    if missing:
+        additions = values(
+            column("id", Uuid), column("product_id", Uuid), column("warehouse_id", Uuid), column("quantity", Integer),
+            name="additions",
+        ).data([(uuid.uuid4(), *key, (merged[key][0] or 0) + merged[key][1]) for key in missing])
+        created = await db.execute(
+            insert(inventories)
+            .from_select(
+                ["id", "product_id", "warehouse_id", "quantity"],
+                select(additions.c.id, additions.c.product_id, additions.c.warehouse_id, additions.c.quantity)
+                .join(Product, Product.id == additions.c.product_id)
+                .join(Warehouse, Warehouse.id == additions.c.warehouse_id)
+                .order_by(additions.c.product_id, additions.c.warehouse_id),
+            )
+            .on_conflict_do_nothing(index_elements=["product_id", "warehouse_id"])
+            .returning(inventories.c.product_id, inventories.c.warehouse_id, inventories.c.quantity)
+        )
+        for product_id, warehouse_id, quantity in created:
+            outcomes[(product_id, warehouse_id)] = InventoryAdjustmentResult(
+                product_id=product_id, warehouse_id=warehouse_id, status="created", quantity=quantity
+            )
+
+    for key in keys:
+        if key not in outcomes:
+            message = "Product or warehouse not found" if key in missing else "Quantity would go negative"
+            outcomes[key] = InventoryAdjustmentResult(product_id=key[0], warehouse_id=key[1], status="rejected",
+                                                      message=message)
+
+    results = [outcomes[(adjustment.product_id, adjustment.warehouse_id)] for adjustment in batch.adjustments]
+    if batch.sync_id is not None:
+        await db.execute(
+            update(InventorySync)
+            .where(InventorySync.sync_id == batch.sync_id)
+            .values(results=[result.model_dump(mode="json") for result in results])
+        )
+    changed = sorted({product_id for (product_id, _), result in outcomes.items() if result.status != "rejected"})
+    if changed:
+        # the deferred trigger updates product_stock at commit in inventory row order; lock in product_id order first
+        await db.execute(
+            select(ProductStock.product_id)
+            .where(ProductStock.product_id.in_(changed))
+            .order_by(ProductStock.product_id)
+            .with_for_update()
+        )
+    await db.commit()
+    invalidate_product_cache(*{product_id for product_id, _ in keys})
+    return InventoryAdjustmentResponse(sync_id=batch.sync_id, results=results)
 
 # Update
-def update_inventory_service(db: AsyncSession, inventory_id: int, inventory_update: InventoryUpdate) -> Optional[Inventory]:
-    inventory = db.get(Inventory, inventory_id)
+async def update_inventory_service(db: AsyncSession, inventory_id: str, inventory_update: InventoryUpdate) -> Optional[Inventory]:
+    inventory = await db.get(Inventory, inventory_id)
     if inventory:
+        previous_product_id = inventory.product_id
         for key, value in inventory_update.dict(exclude_unset=True).items():
             if key == "product_id" and value is not None:
-                if not db.get(Product, value):
+                if not await db.get(Product, value):
                     raise ValueError("Product not found")
             elif key == "warehouse_id" and value is not None:
-                if not db.get(Warehouse, value):
+                if not await db.get(Warehouse, value):
                     raise ValueError("Warehouse not found")
             setattr(inventory, key, value)
         db.add(inventory)
-        db.commit()
-        db.refresh(inventory)
+        await db.commit()
+        invalidate_product_cache(previous_product_id, inventory.product_id)
+        await db.refresh(inventory)
         return inventory
     return None
 
 # Delete
-def delete_inventory_service(db: AsyncSession, inventory_id: int) -> Optional[Inventory]:
-    inventory = db.get(Inventory, inventory_id)
+async def delete_inventory_service(db: AsyncSession, inventory_id: str) -> Optional[Inventory]:
+    inventory = await db.get(Inventory, inventory_id)
     if inventory:
-        db.delete(inventory)
-        db.commit()
+        await db.delete(inventory)
+        await db.commit()
+        invalidate_product_cache(inventory.product_id)
         return inventory
     return None
\ No newline at end of file
@@ -0,0 +1,154 @@
+import math
+import uuid
+from itertools import combinations, islice
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlmodel import SQLModel, Field, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.models.products import Inventory
+from app.core.errors import InsufficientStock
+
+# exact search tries every set of up to MAX_EXACT_SPLITS warehouses while the number of sets stays
+# under MAX_EXACT_COMBINATIONS; larger problems fall back to greedy coverage
+MAX_EXACT_SPLITS = 4
+MAX_EXACT_COMBINATIONS = 250_000
+# bounds the (lines x sets x warehouses) array evaluated at once
+EVALUATION_CELLS = 4_000_000
+
+
+class AllocationLine(SQLModel):
+    product_id: uuid.UUID
+    quantity: int = Field(gt=0)
+
+
+class AllocationRequest(SQLModel):
+    lines: List[AllocationLine] = Field(min_length=1)
+    # cost of shipping from a warehouse, used to choose between allocations with the same split count
+    warehouse_costs: Dict[uuid.UUID, float] = {}
+
+
+class ShipmentItem(SQLModel):
+    product_id: uuid.UUID
+    quantity: int
+
+
+class Shipment(SQLModel):
+    warehouse_id: uuid.UUID
+    cost: float
+    items: List[ShipmentItem]
+
+
+class AllocationResponse(SQLModel):
+    shipments: List[Shipment]
+    split_count: int
+    total_cost: float
+    exact: bool
+
+
+def _fill(requested: np.ndarray, stock: np.ndarray, warehouses: np.ndarray) -> np.ndarray:
+    """Takes each line from `warehouses` in the given order, all lines at once"""
+    chosen = stock[:, warehouses]
+    before = np.cumsum(chosen, axis=1) - chosen
+    allocation = np.zeros_like(stock)
+    allocation[:, warehouses] = np.clip(requested[:, None] - before, 0, chosen)
+    return allocation
+
+
+def _exact_warehouses(requested: np.ndarray, stock: np.ndarray, cost: np.ndarray) -> Optional[np.ndarray]:
+    """Smallest set of warehouses that covers every line, cheapest among equal sizes"""
+    lines, count = stock.shape
+    for size in range(1, min(MAX_EXACT_SPLITS, count) + 1):
+        if math.comb(count, size) > MAX_EXACT_COMBINATIONS:
+            return None
+        best, best_cost = None, math.inf
+        sets = combinations(range(count), size)
+        chunk_size = max(1, EVALUATION_CELLS // (lines * size))
+        while chunk := list(islice(sets, chunk_size)):
+            candidates = np.array(chunk)
+            covered = (stock[:, candidates].sum(axis=2) >= requested[:, None]).all(axis=0)
+            if not covered.any():
+                continue
+            feasible = candidates[covered]
+            costs = cost[feasible].sum(axis=1)
+            cheapest = int(np.argmin(costs))
+            if costs[cheapest] < best_cost:
+                best, best_cost = feasible[cheapest], costs[cheapest]
+        if best is not None:
+            return best
+    return None
+
+
+def _greedy_warehouses(requested: np.ndarray, stock: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """Repeatedly picks the warehouse covering the most remaining units, cheapest on ties"""
+    remaining = requested.copy()
+    unused = np.ones(stock.shape[1], dtype=bool)
+    picked = []
+    while remaining.any():
+        coverage = np.minimum(stock, remaining[:, None]).sum(axis=0)
+        coverage[~unused] = -1
+        warehouse = np.lexsort((cost, -coverage))[0]
+        picked.append(warehouse)
+        unused[warehouse] = False
+        remaining -= np.minimum(stock[:, warehouse], remaining)
+    return np.array(picked)
+
+
+def allocate(requested: np.ndarray, stock: np.ndarray, cost: np.ndarray) -> Tuple[np.ndarray, bool]:
+    """
+    Splits `requested` (one quantity per line) over warehouses given `stock` (lines x warehouses)
+    and a per-warehouse shipment `cost`. Minimizes the number of warehouses shipping, then the cost.
+    Returns the allocation matrix and whether the exact search (rather than greedy) produced it.
+    The caller must ensure every line is coverable.
+    """
+    warehouses = _exact_warehouses(requested, stock, cost)
+    exact = warehouses is not None
+    if not exact:
+        warehouses = _greedy_warehouses(requested, stock, cost)
+    warehouses = warehouses[np.argsort(cost[warehouses], kind="stable")]
+    return _fill(requested, stock, warehouses), exact
+
+
+async def allocate_order_service(db: AsyncSession, request: AllocationRequest) -> AllocationResponse:
+    quantities: Dict[uuid.UUID, int] = {}
+    for line in request.lines:
+        quantities[line.product_id] = quantities.get(line.product_id, 0) + line.quantity
+    product_ids = list(quantities)
+
+    rows = (await db.execute(
+        select(Inventory.product_id, Inventory.warehouse_id, Inventory.quantity)
+        .where(Inventory.product_id.in_(product_ids), Inventory.quantity > 0)
+    )).all()
+    warehouse_ids = sorted({row.warehouse_id for row in rows})
+    line_index = {product_id: index for index, product_id in enumerate(product_ids)}
+    warehouse_index = {warehouse_id: index for index, warehouse_id in enumerate(warehouse_ids)}
+
+    requested = np.array([quantities[product_id] for product_id in product_ids], dtype=np.int64)
+    stock = np.zeros((len(product_ids), len(warehouse_ids)), dtype=np.int64)
+    for product_id, warehouse_id, quantity in rows:
+        stock[line_index[product_id], warehouse_index[warehouse_id]] += quantity
+    cost = np.array([request.warehouse_costs.get(warehouse_id, 0.0) for warehouse_id in warehouse_ids],
+                    dtype=np.float64)
+
+    short = np.flatnonzero(stock.sum(axis=1) < requested)
+    if short.size:
+        raise InsufficientStock(", ".join(
+            f"product {product_ids[index]} requested {requested[index]}, available {stock[index].sum()}"
+            for index in short
+        ))
+
+    # the exact search can take tens of milliseconds on wide inventories, keep it off the event loop
+    allocation, exact = await run_in_threadpool(allocate, requested, stock, cost)
+    shipments = []
+    for column in np.flatnonzero(allocation.any(axis=0)):
+        items = [ShipmentItem(product_id=product_ids[index], quantity=int(allocation[index, column]))
+                 for index in np.flatnonzero(allocation[:, column])]
+        shipments.append(Shipment(warehouse_id=warehouse_ids[column], cost=float(cost[column]), items=items))
+    return AllocationResponse(
+        shipments=shipments,
+        split_count=len(shipments),
+        total_cost=sum(shipment.cost for shipment in shipments),
+        exact=exact,
+    )
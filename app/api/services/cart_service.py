@@ -1,23 +1,68 @@
+import uuid
 from typing import List
 
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.cart.cart_request import AddToCart, UpdateCartQuantity
+from app.api.models.cart.cart_request import AddToCart, UpdateCartQuantity, CartQuantityChange
+from app.api.models.cart.cart_response import CartLine, CartSummary
 from app.api.models.cart.db.cart import Cart
 from app.api.models.products import Product
-from app.api.models.user.db import User
-from app.core.errors import UserNotFound
+from app.api.models.products.product_response import ProductCard
+from app.api.services.product_service import product_card_statement
+
+CART_KEY = [Cart.user_id, Cart.product_id]
 
 
 async def add_to_cart_service(db: AsyncSession, cart_item: AddToCart) -> Cart:
-    if not await db.get(Product, cart_item.product_id):
+    """
+    Single INSERT ... ON CONFLICT: adds the row, or increments the quantity when the product is
+    already in the cart. The product foreign key replaces the separate existence check.
+    """
+    statement = insert(Cart).values(id=uuid.uuid4(), user_id=cart_item.user_id, product_id=cart_item.product_id,
+                                    quantity=cart_item.quantity)
+    statement = statement.on_conflict_do_update(
+        index_elements=CART_KEY,
+        set_={"quantity": Cart.quantity + statement.excluded.quantity},
+    ).returning(Cart).execution_options(populate_existing=True)
+    try:
+        result = await db.execute(statement)
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Product not found")
+    cart_item = result.scalar_one()
+    await db.commit()
+    return cart_item
+
+
+async def update_cart_service(db: AsyncSession, user_id: uuid.UUID, changes: List[CartQuantityChange]) -> List[Cart]:
+    """
+    Sets absolute quantities for many products in one transaction: one DELETE for the zeroes and
+    one multi-row upsert for the rest. A product listed twice takes its last quantity.
+    """
+    quantities = {change.product_id: change.quantity for change in changes}
+    removed = [product_id for product_id, quantity in quantities.items() if quantity == 0]
+    kept = [{"id": uuid.uuid4(), "user_id": user_id, "product_id": product_id, "quantity": quantity}
+            for product_id, quantity in quantities.items() if quantity > 0]
+    try:
+        if removed:
+            await db.execute(delete(Cart).where(Cart.user_id == user_id, Cart.product_id.in_(removed)))
+        if kept:
+            statement = insert(Cart).values(kept)
+            statement = statement.on_conflict_do_update(
+                index_elements=CART_KEY,
+                set_={"quantity": statement.excluded.quantity},
+            )
+            await db.execute(statement)
+    except IntegrityError:
+        await db.rollback()
         raise ValueError("Product not found")
-    cart_model = Cart(**cart_item.dict())
-    db.add(cart_model)
     await db.commit()
-    await db.refresh(cart_model)
-    return cart_model
+    cart = await db.execute(select(Cart).where(Cart.user_id == user_id).execution_options(populate_existing=True))
+    return cart.scalars().all()
 
 
 async def remove_from_cart_service(db: AsyncSession, id: str) -> Cart:
@@ -40,8 +85,36 @@ async def increase_cart_product_quantity_service(db: AsyncSession, quantity: Upd
 
 
 async def get_cart_service(db: AsyncSession, user_id: str) -> List[Product]:
-    db_user = await db.get(User,user_id)
-    if not db_user:
-        raise UserNotFound()
-    products = [cart_item.product for cart_item in db_user.cart]
-    return products
+    statement = select(Product).join(Cart, Cart.product_id == Product.id).where(Cart.user_id == user_id)
+    products = await db.execute(statement)
+    return products.scalars().all()
+
+
+async def get_cart_summary_service(db: AsyncSession, user_id: uuid.UUID) -> CartSummary:
+    """
+    Line items and totals in one statement: the catalog card columns joined to the user's cart rows,
+    with the subtotal and item count computed as window sums over the same rows
+    """
+    line_total = Product.price * Cart.quantity
+    statement = (
+        product_card_statement()
+        .add_columns(
+            Cart.quantity,
+            line_total.label("line_total"),
+            func.sum(line_total).over().label("subtotal"),
+            func.sum(Cart.quantity).over().label("item_count"),
+        )
+        .join(Cart, Cart.product_id == Product.id)
+        .where(Cart.user_id == user_id)
+        .order_by(Product.name, Product.id)
+    )
+    rows = (await db.execute(statement)).mappings().all()
+    if not rows:
+        return CartSummary()
+    return CartSummary(
+        items=[CartLine.model_construct(product=ProductCard.model_construct(**row), quantity=row["quantity"],
+                                        line_total=row["line_total"])
+               for row in rows],
+        subtotal=rows[0]["subtotal"],
+        item_count=rows[0]["item_count"],
+    )
@@ -2,6 +2,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import ProductCategory
 from app.api.models.products.category_request import CategoryCreate
+from app.core.cache import product_cache
 
 
 async def create_category_service(category: CategoryCreate, db: AsyncSession):
@@ -12,10 +13,16 @@ async def create_category_service(category: CategoryCreate, db: AsyncSession):
     return category_model
 
 
-async def delete_category_service(category_id: str, db: AsyncSession):
-    category = db.get(ProductCategory, category_id)
+async def delete_category_service(category_id: int, db: AsyncSession):
+    """
+    Cached product details embed their category, so the whole product cache is dropped after a
+    category write; categories change rarely, and finding the affected products would cost a query.
+    A category that still has products raises IntegrityError.
+    """
+    category = await db.get(ProductCategory, category_id)
     if category:
         await db.delete(category)
         await db.commit()
+        product_cache.clear()
         return category
     return None
@@ -0,0 +1,202 @@
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, Uuid, column, delete, true, update, values
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.models.cart.db.cart import Cart
+from app.api.models.orders import Order, OrderItem
+from app.api.models.orders.order_response import OrderRead, OrderItemRead
+from app.api.models.products import Product, Inventory, ProductStock
+from app.api.services.product_service import invalidate_product_cache
+from app.api.utils.pagination import Keyset, Page
+from app.core.errors import InsufficientStock
+
+order_keyset = Keyset(Order.created_at, Order.id, descending=True)
+
+
+def _allocate(rows, quantity: int) -> List[Tuple[uuid.UUID, uuid.UUID, int]]:
+    """Takes from the fullest warehouses first, so an order line is split as little as possible"""
+    allocation = []
+    for inventory_id, warehouse_id, available in sorted(rows, key=lambda row: row[2], reverse=True):
+        if quantity == 0:
+            break
+        taken = min(available, quantity)
+        allocation.append((inventory_id, warehouse_id, taken))
+        quantity -= taken
+    return allocation
+
+
+def _next_unlocked_rows(product_ids: List[uuid.UUID], locked: List[uuid.UUID]):
+    """The fullest inventory row per product that no other transaction holds, locked as it is returned"""
+    lines = values(column("product_id", Uuid), name="lines").data([(product_id,) for product_id in product_ids])
+    candidate = (
+        select(Inventory.id, Inventory.warehouse_id, Inventory.quantity)
+        .where(Inventory.product_id == lines.c.product_id, Inventory.quantity > 0)
+        .order_by(Inventory.quantity.desc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if locked:
+        candidate = candidate.where(Inventory.id.not_in(locked))
+    candidate = candidate.lateral("candidate")
+    return select(
+        lines.c.product_id, candidate.c.id, candidate.c.warehouse_id, candidate.c.quantity
+    ).join_from(lines, candidate, true())
+
+
+async def _lock_unlocked_rows(db: AsyncSession, quantities: Dict[uuid.UUID, int]) -> Optional[Dict[uuid.UUID, list]]:
+    """
+    Locks just enough inventory rows to cover every line, skipping rows other checkouts hold.
+    Each round adds one row for every line still short, so a line covered by its fullest free
+    warehouse costs one round and locks one row. Returns None when some line cannot be covered
+    by free rows.
+    """
+    rows: Dict[uuid.UUID, list] = {product_id: [] for product_id in quantities}
+    remaining = dict(quantities)
+    locked = []
+    while remaining:
+        result = await db.execute(_next_unlocked_rows(sorted(remaining), locked))
+        found = set()
+        for product_id, inventory_id, warehouse_id, quantity in result:
+            rows[product_id].append((inventory_id, warehouse_id, quantity))
+            locked.append(inventory_id)
+            remaining[product_id] -= quantity
+            found.add(product_id)
+        if len(found) < len(remaining):
+            return None
+        remaining = {product_id: quantity for product_id, quantity in remaining.items() if quantity > 0}
+    return rows
+
+
+async def _lock_all_rows(db: AsyncSession, quantities: Dict[uuid.UUID, int]) -> Dict[uuid.UUID, list]:
+    """
+    Waits for every inventory row of the products, taking the locks in (product_id, warehouse_id)
+    order, the same order inventory syncs lock in
+    """
+    result = await db.execute(
+        select(Inventory.product_id, Inventory.id, Inventory.warehouse_id, Inventory.quantity)
+        .where(Inventory.product_id.in_(quantities), Inventory.quantity > 0)
+        .order_by(Inventory.product_id, Inventory.warehouse_id)
+        .with_for_update()
+    )
+    rows: Dict[uuid.UUID, list] = {product_id: [] for product_id in quantities}
+    for product_id, inventory_id, warehouse_id, quantity in result:
+        rows[product_id].append((inventory_id, warehouse_id, quantity))
+    return rows
+
+
+async def _reserve_stock(db: AsyncSession,
+                         quantities: Dict[uuid.UUID, int]) -> Dict[uuid.UUID, List[Tuple[uuid.UUID, int]]]:
+    """
+    Decrements the requested quantity of every product across warehouses and returns
+    (warehouse_id, taken) pairs per product. The statement count does not depend on the number of lines.
+
+    Rows are locked with SKIP LOCKED, one per still-uncovered line and round, so concurrent checkouts
+    of the same product take different warehouse rows instead of queueing behind one lock. Only when
+    the free rows cannot cover the cart does it roll back to the savepoint, releasing those locks, and
+    wait for all rows in id order. The decrement is a single conditional
+    UPDATE ... WHERE quantity >= n, so stock can never go negative.
+    """
+    savepoint = await db.begin_nested()
+    rows = await _lock_unlocked_rows(db, quantities)
+    if rows is None:
+        await savepoint.rollback()
+        savepoint = await db.begin_nested()
+        rows = await _lock_all_rows(db, quantities)
+
+    short = []
+    for product_id, quantity in quantities.items():
+        available = sum(row[2] for row in rows[product_id])
+        if available < quantity:
+            short.append(f"product {product_id} requested {quantity}, available {available}")
+    if short:
+        await savepoint.rollback()
+        raise InsufficientStock(", ".join(short))
+
+    allocation = {product_id: _allocate(rows[product_id], quantity) for product_id, quantity in quantities.items()}
+    taken = values(column("id", Uuid), column("taken", Integer), name="taken").data(
+        [(inventory_id, count) for lines in allocation.values() for inventory_id, _, count in lines]
+    )
+    inventories = Inventory.__table__
+    updated = (await db.execute(
+        update(inventories)
+        .where(inventories.c.id == taken.c.id, inventories.c.quantity >= taken.c.taken)
+        .values(quantity=inventories.c.quantity - taken.c.taken)
+        .returning(inventories.c.id)
+    )).all()
+    if len(updated) < sum(len(lines) for lines in allocation.values()):
+        await savepoint.rollback()
+        raise InsufficientStock("stock changed during checkout")
+    await savepoint.commit()
+    return {product_id: [(warehouse_id, count) for _, warehouse_id, count in lines]
+            for product_id, lines in allocation.items()}
+
+
+async def checkout_service(db: AsyncSession, user_id: uuid.UUID) -> OrderRead:
+    """
+    Turns the user's cart into an order in one transaction, with a fixed number of statements
+    whatever the cart size. Cart rows are locked so the same cart cannot be checked out twice
+    concurrently.
+    """
+    cart = (await db.execute(
+        select(Cart.product_id, Cart.quantity, Product.price)
+        .join(Product, Product.id == Cart.product_id)
+        .where(Cart.user_id == user_id)
+        .order_by(Cart.product_id)
+        .with_for_update(of=Cart)
+    )).all()
+    if not cart:
+        raise ValueError("Cart is empty")
+
+    try:
+        reserved = await _reserve_stock(db, {line.product_id: line.quantity for line in cart})
+    except InsufficientStock:
+        await db.rollback()
+        raise
+    # the deferred product_stock trigger updates these rows at commit in whatever order the inventory
+    # rows were updated; locking them up front in id order keeps two checkouts from deadlocking there
+    await db.execute(
+        select(ProductStock.product_id)
+        .where(ProductStock.product_id.in_(reserved))
+        .order_by(ProductStock.product_id)
+        .with_for_update()
+    )
+
+    order = Order(user_id=user_id, total=sum(line.price * line.quantity for line in cart))
+    items = [
+        OrderItem(order_id=order.id, product_id=product_id, warehouse_id=warehouse_id, quantity=taken,
+                  unit_price=price)
+        for product_id, _, price in cart
+        for warehouse_id, taken in reserved[product_id]
+    ]
+    db.add(order)
+    db.add_all(items)
+    await db.execute(delete(Cart).where(Cart.user_id == user_id))
+    await db.commit()
+    invalidate_product_cache(*reserved)
+    return OrderRead(**order.model_dump(), items=[OrderItemRead.model_validate(item) for item in items])
+
+
+async def get_order_service(db: AsyncSession, user_id: uuid.UUID, order_id: str) -> Optional[OrderRead]:
+    try:
+        order_id = uuid.UUID(order_id)
+    except ValueError:
+        return None
+    statement = (
+        select(Order)
+        .where(Order.id == order_id, Order.user_id == user_id)
+        .options(selectinload(Order.items))
+    )
+    order = (await db.execute(statement)).scalars().first()
+    return OrderRead.model_validate(order) if order else None
+
+
+async def get_orders_service(db: AsyncSession, user_id: uuid.UUID, cursor: Optional[str] = None,
+                             limit: int = 20) -> Page[OrderRead]:
+    statement = select(Order).where(Order.user_id == user_id).options(selectinload(Order.items))
+    statement = order_keyset.apply(statement, cursor=cursor, limit=limit)
+    orders = await db.execute(statement)
+    return order_keyset.page(orders.scalars(), cursor=cursor, limit=limit, item=OrderRead.model_validate)
@@ -1,10 +1,15 @@
-from typing import Optional, List
+import uuid
+from typing import Optional, List, Tuple
 
 from sqlmodel import SQLModel, Field, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import Product, ProductImage
+from app.api.services.product_service import invalidate_product_cache
+from app.api.utils.etag import row_version, version_etag
+from app.api.utils.pagination import Keyset, Page
 
+product_image_keyset = Keyset(ProductImage.id)
 
 
 class ProductImageCreate(SQLModel):
@@ -21,24 +26,36 @@ class ProductImageUpdate(SQLModel):
 
 # Create
 async def create_product_image_service(db: AsyncSession, product_image: ProductImageCreate) -> ProductImage:
-    if not db.get(Product, product_image.product_id):
+    if not await db.get(Product, product_image.product_id):
         raise ValueError("Product not found")
     image_model = ProductImage(**product_image.dict())
     db.add(image_model)
     await db.commit()
+    invalidate_product_cache(product_image.product_id)
     await db.refresh(image_model)
     return image_model
 
 
 # Read One
-async def get_product_image_service(db: AsyncSession, image_id: str) -> Optional[ProductImage]:
-    return await db.get(ProductImage, image_id)
+async def get_product_image_service(db: AsyncSession, image_id: str) -> Optional[Tuple[ProductImage, str]]:
+    """An image and its ETag, taken from the row version so a conditional hit is not serialized"""
+    try:
+        key = uuid.UUID(str(image_id))
+    except ValueError:
+        return None
+    row = (await db.execute(select(ProductImage, row_version(ProductImage)).where(ProductImage.id == key))).first()
+    if row is None:
+        return None
+    image, version = row
+    return image, version_etag("product_image", image.id, version)
 
 
 # Read All
-async def get_product_images_service(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ProductImage]:
-    product_images = await db.execute(statement=select(ProductImage).offset(skip).limit(limit))
-    return product_images.scalars().all()
+async def get_product_images_service(db: AsyncSession, cursor: Optional[str] = None, skip: int = 0,
+                                     limit: int = 100) -> Page[ProductImage]:
+    statement = product_image_keyset.apply(select(ProductImage), cursor=cursor, limit=limit, skip=skip)
+    product_images = await db.execute(statement)
+    return product_image_keyset.page(product_images.scalars(), cursor=cursor, limit=limit, skip=skip)
 
 
 # Update
@@ -46,10 +63,12 @@ async def update_product_image_service(db: AsyncSession, image_id: str, image_up
     ProductImage]:
     image = await db.get(ProductImage, image_id)
     if image:
+        previous_product_id = image.product_id
         for key, value in image_update.dict(exclude_unset=True).items():
             setattr(image, key, value)
         db.add(image)
         await db.commit()
+        invalidate_product_cache(previous_product_id, image.product_id)
         await db.refresh(image)
         return image
     return None
@@ -61,5 +80,6 @@ async def delete_product_image_service(db: AsyncSession, image_id: str) -> Optio
     if image:
         await db.delete(image)
         await db.commit()
+        invalidate_product_cache(image.product_id)
         return image
     return None
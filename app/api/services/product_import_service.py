@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+import uuid
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import anyio
+from pydantic import ValidationError
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Uuid, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.models.products import Product, ProductCategory, ProductImport, ProductImportError
+from app.api.models.products.db.product_import import ImportStatus
+from app.api.models.products.product_request import ProductCreate, CatalogFormat
+from app.api.utils.pagination import Keyset, Page
+from app.core.db import async_session_maker
+
+IMPORT_CHUNK_SIZE = 5000
+
+# per-transaction staging table, kept out of SQLModel.metadata so migrations never see it
+staging_table = Table(
+    "product_import_staging",
+    MetaData(),
+    Column("id", Uuid),
+    Column("name", String),
+    Column("description", String),
+    Column("price", Float),
+    Column("category_id", Integer),
+    Column("row_number", Integer),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+import_error_keyset = Keyset(ProductImportError.id)
+
+
+def _read_rows(source, import_format: CatalogFormat) -> Iterator[Tuple[int, str, Optional[dict]]]:
+    """Yields (row number, raw text, parsed record or None) without buffering the file"""
+    if import_format == CatalogFormat.csv:
+        for row_number, record in enumerate(csv.DictReader(source), start=1):
+            yield row_number, json.dumps(record), record
+        return
+    for row_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield row_number, line.rstrip("\n"), record if isinstance(record, dict) else None
+
+
+def _next_chunk(rows: Iterator[Tuple[int, str, Optional[dict]]]) -> List[Tuple[int, str, Optional[dict]]]:
+    return list(islice(rows, IMPORT_CHUNK_SIZE))
+
+
+def _validate_chunk(import_id: uuid.UUID, chunk: List[Tuple[int, str, Optional[dict]]]
+                    ) -> Tuple[Dict[int, str], List[tuple], List[ProductImportError]]:
+    """Checks each record against ProductCreate; returns raw rows by number, staging records and row errors"""
+    raw_rows = {}
+    records = []
+    errors = []
+    for row_number, raw, record in chunk:
+        raw_rows[row_number] = raw
+        if record is None:
+            errors.append(ProductImportError(import_id=import_id, row_number=row_number,
+                                             message="Malformed record", raw=raw))
+            continue
+        try:
+            product = ProductCreate.model_validate(record)
+        except ValidationError as e:
+            errors.append(ProductImportError(import_id=import_id, row_number=row_number,
+                                             message=str(e.errors(include_url=False)), raw=raw))
+            continue
+        records.append((uuid.uuid4(), product.name, product.description, product.price, product.category_id,
+                        row_number))
+    return raw_rows, records, errors
+
+
+async def _load_chunk(db: AsyncSession, job: ProductImport, chunk: List[Tuple[int, str, Optional[dict]]]) -> None:
+    """
+    Validates one chunk with the same rules as create_product_service (ProductCreate fields,
+    existing category), COPYs the valid rows into the staging table and merges them into
+    products with one INSERT ... SELECT. Commits, so progress is visible while the import runs.
+    Validation runs on a worker thread so a large chunk does not hold up other requests.
+    """
+    raw_rows, records, errors = await anyio.to_thread.run_sync(_validate_chunk, job.id, chunk)
+    inserted = 0
+    if records:
+        connection = await db.connection()
+        await connection.run_sync(staging_table.create)
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_table.name, records=records, columns=[column.name for column in staging_table.columns]
+        )
+        missing_categories = await db.execute(
+            select(staging_table.c.row_number, staging_table.c.category_id)
+            .outerjoin(ProductCategory, ProductCategory.id == staging_table.c.category_id)
+            .where(ProductCategory.id.is_(None))
+        )
+        for row_number, category_id in missing_categories:
+            errors.append(ProductImportError(import_id=job.id, row_number=row_number,
+                                             message=f"Category not found: {category_id}", raw=raw_rows[row_number]))
+        merged = await db.execute(
+            insert(Product.__table__).from_select(
+                ["id", "name", "description", "price", "category_id"],
+                select(staging_table.c.id, staging_table.c.name, staging_table.c.description,
+                       staging_table.c.price, staging_table.c.category_id)
+                .join(ProductCategory, ProductCategory.id == staging_table.c.category_id),
+            )
+        )
+        inserted = merged.rowcount
+
+    db.add_all(errors)
+    job.processed_rows += len(chunk)
+    job.inserted_rows += inserted
+    job.error_rows += len(errors)
+    db.add(job)
+    await db.commit()
+
+
+async def create_product_import_service(db: AsyncSession, import_format: CatalogFormat) -> ProductImport:
+    job = ProductImport(format=import_format.value)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def run_product_import(import_id: uuid.UUID, path: str, import_format: CatalogFormat,
+                             remove_source: bool = False) -> ProductImport:
+    """
+    Runs a whole import in IMPORT_CHUNK_SIZE chunks, one transaction per chunk. The file is opened,
+    read and parsed on worker threads, one chunk at a time, so the event loop only waits on the database.
+    """
+    async with async_session_maker() as db:
+        job = await db.get(ProductImport, import_id)
+        job.status = ImportStatus.running.value
+        await db.commit()
+        try:
+            source = await anyio.to_thread.run_sync(partial(open, path, newline="", encoding="utf-8"))
+            try:
+                rows = _read_rows(source, import_format)
+                while chunk := await anyio.to_thread.run_sync(_next_chunk, rows):
+                    await _load_chunk(db, job, chunk)
+            finally:
+                source.close()
+            job.status = ImportStatus.completed.value
+        except Exception as e:
+            await db.rollback()
+            job = await db.get(ProductImport, import_id)
+            job.status = ImportStatus.failed.value
+            job.message = str(e)
+        finally:
+            if remove_source:
+                os.remove(path)
+        job.finished_at = datetime.utcnow()
+        db.add(job)
+        await db.commit()
+        return job
+
+
+async def get_product_import_service(db: AsyncSession, import_id: str) -> Optional[ProductImport]:
+    return await db.get(ProductImport, import_id)
+
+
+async def get_product_import_errors_service(db: AsyncSession, import_id: str, cursor: Optional[str] = None,
+                                            limit: int = 100) -> Page[ProductImportError]:
+    statement = select(ProductImportError).where(ProductImportError.import_id == import_id)
+    statement = import_error_keyset.apply(statement, cursor=cursor, limit=limit)
+    errors = await db.execute(statement)
+    return import_error_keyset.page(errors.scalars(), cursor=cursor, limit=limit)
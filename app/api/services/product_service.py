@@ -1,11 +1,30 @@
-from typing import List, Optional
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
 
+from sqlalchemy import Float, Text, cast, func, insert, or_
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.products.db.product import Product
-from app.api.models.products.db.product_category import ProductCategory
-from app.api.models.products.product_request import ProductCreate, ProductUpdate
+from app.api.models.products import Product, ProductCategory, ProductImage, ProductStock, ProductRating
+from app.api.models.products.product_request import ProductCreate, ProductUpdate, CatalogFormat
+from app.api.models.products.product_response import ProductDetail, ProductCard, ProductSearchHit, CategoryRead, \
+    ProductImageRead
+from app.api.utils.etag import compute_etag, row_version, version_etag
+from app.api.utils.pagination import Keyset, Page
+from app.core.cache import product_cache
+from app.core.db import async_session_maker
+
+SEARCH_CONFIG = "english"
+SNIPPET_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=5, MaxFragments=2"
+
+EXPORT_CHUNK_SIZE = 1000
+
+product_keyset = Keyset(Product.created_at, Product.id, descending=True)
 
 
 async def create_product_service(db: AsyncSession, product: ProductCreate) -> Product:
@@ -19,41 +38,261 @@ async def create_product_service(db: AsyncSession, product: ProductCreate) -> Pr
     return product_model
 
 
-async def get_product_service(db: AsyncSession, product_id: str) -> Optional[Product]:
-    return await db.get(Product, product_id)
+async def find_missing_categories(db: AsyncSession, category_ids: Iterable[int]) -> Set[int]:
+    category_ids = set(category_ids)
+    existing = await db.execute(select(ProductCategory.id).where(ProductCategory.id.in_(category_ids)))
+    return category_ids - set(existing.scalars().all())
+
+
+async def create_products_service(db: AsyncSession, products: List[ProductCreate]) -> List[Product]:
+    """
+    All-or-nothing bulk create: every distinct category is validated in one query,
+    rows go out as batched multi-row INSERT ... RETURNING and the batch commits once
+    """
+    if not products:
+        return []
+    missing = await find_missing_categories(db, (product.category_id for product in products))
+    if missing:
+        rows = [index for index, product in enumerate(products) if product.category_id in missing]
+        raise ValueError(f"Category not found: {sorted(missing)} (rows {rows})")
+    values = [Product(**product.dict()).model_dump() for product in products]
+    result = await db.execute(insert(Product).returning(Product, sort_by_parameter_order=True), values)
+    created = result.scalars().all()
+    await db.commit()
+    return created
+
+
+def product_cache_key(product_id) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(product_id))
+    except ValueError:
+        return None
+
+
+def invalidate_product_cache(*product_ids) -> None:
+    """Drops cached product details, called after any committed write that changes data hanging off a product"""
+    product_cache.invalidate(*(key for key in map(product_cache_key, product_ids) if key is not None))
+
+
+async def get_product_service(db: AsyncSession, product_id: str,
+                              fields: Optional[Set[str]] = None) -> Optional[Tuple[ProductDetail, Optional[str]]]:
+    """
+    Product detail and its ETag; both are cached together so a conditional hit costs no serialization.
+    With `fields`, a cached detail is reused as is; otherwise only the requested columns and
+    relationships are loaded and the partial detail is neither cached nor given an ETag.
+    """
+    key = product_cache_key(product_id)
+    if key is None:
+        return None
+    cached = product_cache.get(key)
+    if cached is not None:
+        return cached if fields is None else (cached[0], None)
+    if fields is not None:
+        return await _get_partial_product(db, key, fields)
+    generation = product_cache.generation
+    statement = select(Product).where(Product.id == key).options(
+        joinedload(Product.category),
+        selectinload(Product.images),
+    )
+    result = await db.execute(statement)
+    product = result.scalars().first()
+    if product is None:
+        return None
+    detail = ProductDetail.model_validate(product)
+    entry = (detail, compute_etag(detail.model_dump_json()))
+    product_cache.set(key, entry, generation=generation)
+    return entry
 
 
-async def get_products_service(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Product]:
-    products = await db.execute(statement=select(Product).offset(skip).limit(limit))
-    return products.scalars().all()
+PRODUCT_DETAIL_COLUMNS = {"name", "description", "price", "category_id"}
 
 
-async def get_products_by_name_service(db: AsyncSession, name_filter: str, skip: int = 0, limit: int = 100) -> List[
-    Product]:
-    statement = select(Product).where(Product.name.ilike(f"%{name_filter}%")).offset(skip).limit(limit)
+async def _get_partial_product(db: AsyncSession, key: uuid.UUID,
+                               fields: Set[str]) -> Optional[Tuple[ProductDetail, None]]:
+    columns = [getattr(Product, field) for field in fields if field in PRODUCT_DETAIL_COLUMNS]
+    options = [load_only(Product.id, *columns)]
+    if "category" in fields:
+        options.append(joinedload(Product.category))
+    if "images" in fields:
+        options.append(selectinload(Product.images))
+    result = await db.execute(select(Product).where(Product.id == key).options(*options))
+    product = result.scalars().first()
+    if product is None:
+        return None
+    values = {field: getattr(product, field) for field in fields if field in PRODUCT_DETAIL_COLUMNS}
+    if "category" in fields:
+        values["category"] = CategoryRead.model_validate(product.category) if product.category else None
+    if "images" in fields:
+        values["images"] = [ProductImageRead.model_validate(image) for image in product.images]
+    return ProductDetail.model_construct(id=product.id, **values), None
+
+
+def product_card_statement(fields: Optional[Set[str]] = None, versioned: bool = False):
+    """
+    Card columns for catalog listings, resolved in a single statement
+    (category, stock and rating aggregates via joins, primary image via a correlated subquery).
+    With `fields`, only those card columns are selected and only the joins they need are made;
+    id and created_at are always selected for keyset pagination.
+    `versioned` adds a row_version column joining the xmin of every joined row a card is read from.
+    """
+    def wanted(*names):
+        return fields is None or any(name in fields for name in names)
+
+    columns = [Product.id, Product.created_at]
+    versions = [row_version(Product)]
+    if wanted("name"):
+        columns.append(Product.name)
+    if wanted("price"):
+        columns.append(Product.price)
+    if wanted("category_name"):
+        columns.append(ProductCategory.name.label("category_name"))
+        versions.append(row_version(ProductCategory))
+    if wanted("image"):
+        primary_image = (
+            select(ProductImage.image)
+            .where(ProductImage.product_id == Product.id)
+            .order_by(ProductImage.primary_image.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        columns.append(primary_image.label("image"))
+    if wanted("average_rating"):
+        average_rating = ProductRating.rating_sum / func.nullif(ProductRating.review_count, 0).cast(Float)
+        columns.append(average_rating.label("average_rating"))
+    if wanted("review_count"):
+        columns.append(func.coalesce(ProductRating.review_count, 0).label("review_count"))
+    if wanted("in_stock"):
+        columns.append((func.coalesce(ProductStock.quantity, 0) > 0).label("in_stock"))
+        versions.append(row_version(ProductStock))
+    if wanted("average_rating", "review_count"):
+        versions.append(row_version(ProductRating))
+    if versioned:
+        row_versions = func.concat_ws("/", *(func.coalesce(cast(version, Text), "") for version in versions))
+        columns.append(row_versions.label("row_version"))
+
+    statement = select(*columns).select_from(Product)
+    if wanted("category_name"):
+        statement = statement.outerjoin(ProductCategory, ProductCategory.id == Product.category_id)
+    if wanted("in_stock"):
+        statement = statement.outerjoin(ProductStock, ProductStock.product_id == Product.id)
+    if wanted("average_rating", "review_count"):
+        statement = statement.outerjoin(ProductRating, ProductRating.product_id == Product.id)
+    return statement
+
+
+async def get_products_service(db: AsyncSession, cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+                               fields: Optional[Set[str]] = None) -> Tuple[Page[ProductCard], str]:
+    """
+    One page of product cards and its ETag. The tag is built from the page parameters and each card's
+    id and row versions; the primary image has no joined row, so its path stands in for its version.
+    """
+    statement = product_keyset.apply(product_card_statement(fields, versioned=True), cursor=cursor, limit=limit,
+                                     skip=skip)
+    products = (await db.execute(statement)).mappings().all()
+    etag = version_etag("cards", sorted(fields or ()), cursor, skip, limit,
+                        *((row["id"], row["row_version"], row.get("image")) for row in products))
+    # card columns are typed to match ProductCard, so rows are trusted and built without validation;
+    # model_construct drops the row_version column
+    page = product_keyset.page(products, cursor=cursor, limit=limit, skip=skip,
+                               item=lambda row: ProductCard.model_construct(**row))
+    return page, etag
+
+
+async def get_products_by_name_service(db: AsyncSession, name_filter: str, cursor: Optional[str] = None,
+                                       skip: int = 0, limit: int = 100,
+                                       fields: Optional[Set[str]] = None) -> Page[ProductSearchHit]:
+    """
+    Ranked search over name and description: full-text matches on the weighted
+    search_vector, with trigram similarity on the name as a typo-tolerant fallback.
+    The snippet (ts_headline re-parses every matched document) is only computed when requested.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, name_filter)
+    relevance = (
+        func.ts_rank_cd(Product.search_vector, query, type_=Float)
+        + func.similarity(Product.name, name_filter, type_=Float)
+    ).label("relevance")
+    # name and description together, like the search document, so a hit on the name alone is highlighted too
+    snippet = func.ts_headline(
+        SEARCH_CONFIG, func.concat_ws(" ", Product.name, Product.description), query, SNIPPET_OPTIONS
+    ).label("snippet")
+    statement = product_card_statement(fields).add_columns(relevance)
+    if fields is None or "snippet" in fields:
+        statement = statement.add_columns(snippet)
+    statement = statement.where(
+        or_(Product.search_vector.op("@@")(query), Product.name.op("%")(name_filter))
+    )
+    search_keyset = Keyset(relevance, Product.id, descending=True)
+    statement = search_keyset.apply(statement, cursor=cursor, limit=limit, skip=skip)
     products = await db.execute(statement)
-    return products.scalars().all()
+    return search_keyset.page(products.mappings(), cursor=cursor, limit=limit, skip=skip,
+                              item=lambda row: ProductSearchHit.model_construct(**row))
 
 
 async def update_product_service(db: AsyncSession, product_id: str, product_update: ProductUpdate) -> Optional[Product]:
-    product = db.get(Product, product_id)
+    product = await db.get(Product, product_id)
     if product:
         for key, value in product_update.dict(exclude_unset=True).items():
             if key == "category_id" and value is not None:
-                if not db.get(ProductCategory, value):
+                if not await db.get(ProductCategory, value):
                     raise ValueError("Category not found")
             setattr(product, key, value)
         db.add(product)
         await db.commit()
+        invalidate_product_cache(product_id)
         await db.refresh(product)
         return product
     return None
 
 
 async def delete_product_service(db: AsyncSession, product_id: str) -> Optional[Product]:
-    product = db.get(Product, product_id)
+    """
+    Images, reviews, inventories and cart rows go with the product (ON DELETE CASCADE);
+    order items do not, so a product that was ever ordered raises IntegrityError
+    """
+    product = await db.get(Product, product_id)
     if product:
         await db.delete(product)
         await db.commit()
+        invalidate_product_cache(product_id)
         return product
     return None
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def stream_products_export_service(export_format: CatalogFormat) -> AsyncIterator[str]:
+    """
+    Streams the whole catalog through a server-side cursor, EXPORT_CHUNK_SIZE rows at a time.
+    Opens its own session because the response body is produced after request dependencies exit.
+    """
+    statement = select(
+        Product.id,
+        Product.name,
+        Product.description,
+        Product.price,
+        Product.category_id,
+        ProductCategory.name.label("category_name"),
+        Product.created_at,
+    ).outerjoin(ProductCategory, ProductCategory.id == Product.category_id).order_by(
+        Product.created_at, Product.id
+    ).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    async with async_session_maker() as session:
+        result = await session.stream(statement)
+        if export_format == CatalogFormat.csv:
+            yield ",".join(result.keys()) + "\r\n"
+        async for partition in result.mappings().partitions():
+            buffer = io.StringIO()
+            if export_format == CatalogFormat.csv:
+                writer = csv.writer(buffer)
+                writer.writerows([[_export_value(value) for value in row.values()] for row in partition])
+            else:
+                for row in partition:
+                    buffer.write(json.dumps({key: _export_value(value) for key, value in row.items()}))
+                    buffer.write("\n")
+            yield buffer.getvalue()
@@ -1,10 +1,18 @@
+import uuid
 from typing import Optional, List
 
-from sqlmodel import SQLModel, Field
+from sqlalchemy import exists, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel, Field, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.models.products import Product, Review
+from app.api.models.products import Product, Review, ProductRating
+from app.api.models.products.product_request import ReviewOrder
+from app.api.models.products.product_response import ProductRatingRead, ProductReviewRead
 from app.api.models.user.db import User
+from app.api.services.product_service import invalidate_product_cache, product_cache_key
+from app.api.utils.pagination import Keyset, Page
+from app.core.cache import product_cache
 
 
 
@@ -28,6 +36,59 @@ class ReviewUpdate(SQLModel):
     review_message: Optional[str] = None
 
 
+RATING_COLUMNS = {rating: getattr(ProductRating, f"rating_{rating}") for rating in range(1, 6)}
+
+
+async def _adjust_product_rating(db: AsyncSession, product_id: uuid.UUID, rating: int, change: int) -> None:
+    """Adds (change=1) or removes (change=-1) one review's rating from the product's aggregate row"""
+    bucket = RATING_COLUMNS[rating]
+    statement = insert(ProductRating).values(
+        product_id=product_id, review_count=change, rating_sum=change * rating, **{bucket.key: change}
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[ProductRating.product_id],
+        set_={
+            "review_count": ProductRating.review_count + statement.excluded.review_count,
+            "rating_sum": ProductRating.rating_sum + statement.excluded.rating_sum,
+            bucket.key: bucket + statement.excluded[bucket.key],
+        },
+    )
+    await db.execute(statement)
+
+
+async def _move_product_rating(db: AsyncSession, previous: tuple, current: tuple) -> None:
+    """
+    Moves one review's rating between (product_id, rating) buckets. The aggregate rows are updated
+    in product_id order, so two reviews moving in opposite directions cannot deadlock.
+    """
+    changes = [(uuid.UUID(str(previous[0])), previous[1], -1), (uuid.UUID(str(current[0])), current[1], 1)]
+    for product_id, rating, change in sorted(changes, key=lambda change: change[0]):
+        await _adjust_product_rating(db, product_id, rating, change)
+
+
+async def get_product_rating_service(db: AsyncSession, product_id: str) -> Optional[ProductRatingRead]:
+    key = product_cache_key(product_id)
+    if key is None:
+        return None
+    statement = (
+        select(Product.id, ProductRating)
+        .outerjoin(ProductRating, ProductRating.product_id == Product.id)
+        .where(Product.id == key)
+    )
+    row = (await db.execute(statement)).first()
+    if row is None:
+        return None
+    aggregate = row[1]
+    if aggregate is None or not aggregate.review_count:
+        return ProductRatingRead(product_id=key, histogram={rating: 0 for rating in RATING_COLUMNS})
+    return ProductRatingRead(
+        product_id=key,
+        review_count=aggregate.review_count,
+        average_rating=aggregate.rating_sum / aggregate.review_count,
+        histogram={rating: getattr(aggregate, column.key) for rating, column in RATING_COLUMNS.items()},
+    )
+
+
 # Create
 async def create_review_service(db: AsyncSession, review: ReviewCreate) -> Review:
     if not await db.get(Product, review.product_id):
@@ -38,7 +99,9 @@ async def create_review_service(db: AsyncSession, review: ReviewCreate) -> Revie
         raise ValueError("Rating must be between 1 and 5")
     review_model = Review(**review.dict())
     db.add(review_model)
+    await _adjust_product_rating(db, review_model.product_id, review_model.rating, 1)
     await db.commit()
+    invalidate_product_cache(review.product_id)
     await db.refresh(review_model)
     return review_model
 
@@ -46,15 +109,49 @@ async def create_review_service(db: AsyncSession, review: ReviewCreate) -> Revie
 async def get_review_service(db: AsyncSession, review_id: str) -> Optional[Review]:
     return await db.get(Review, review_id)
 
-# # Read All
-# async def get_reviews_service(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Review]:
-#     return db.query(Review).offset(skip).limit(limit).all()
+# Read a product's reviews
+review_keysets = {
+    ReviewOrder.newest: Keyset(Review.created_at, Review.id, descending=True),
+    ReviewOrder.rating: Keyset(Review.rating, Review.created_at, Review.id, descending=True),
+}
+
+
+async def get_product_reviews_service(db: AsyncSession, product_id: str, order: ReviewOrder = ReviewOrder.newest,
+                                      cursor: Optional[str] = None, limit: int = 20) -> Optional[Page[ProductReviewRead]]:
+    """
+    One page of a product's reviews with reviewer display names joined in, walking one of the product indexes.
+    None for an unknown product; existence is only checked for an empty page that the product cache cannot vouch for.
+    """
+    key = product_cache_key(product_id)
+    if key is None:
+        return None
+    keyset = review_keysets[order]
+    reviewer_name = func.concat(User.first_name, " ", func.left(User.last_name, 1), ".")
+    statement = (
+        select(Review.id, Review.rating, Review.review_message, Review.created_at, Review.reviewer_id,
+               reviewer_name.label("reviewer_name"))
+        .join(User, User.id == Review.reviewer_id)
+        .where(Review.product_id == key)
+    )
+    statement = keyset.apply(statement, cursor=cursor, limit=limit)
+    reviews = (await db.execute(statement)).mappings().all()
+    if not reviews and product_cache.get(key) is None:
+        if not await db.scalar(select(exists().where(Product.id == key))):
+            return None
+    return keyset.page(reviews, cursor=cursor, limit=limit, item=lambda row: ProductReviewRead.model_construct(**row))
 
 # Update
 async def update_review_service(db: AsyncSession, review_id: str, review_update: ReviewUpdate) -> Optional[Review]:
-    review = await db.get(Review, review_id)
+    """
+    The review row is locked before its old product and rating are read, so concurrent updates
+    apply their aggregate changes one after the other instead of both removing the same old rating
+    """
+    review = await db.get(Review, review_id, with_for_update=True)
     if review:
+        previous_product_id, previous_rating = review.product_id, review.rating
         for key, value in review_update.dict(exclude_unset=True).items():
+            if value is None and key in ("product_id", "reviewer_id", "rating"):
+                raise ValueError(f"{key} cannot be null")
             if key == "product_id" and value is not None:
                 if not await db.get(Product, value):
                     raise ValueError("Product not found")
@@ -66,16 +163,22 @@ async def update_review_service(db: AsyncSession, review_id: str, review_update:
                     raise ValueError("Rating must be between 1 and 5")
             setattr(review, key, value)
         db.add(review)
+        if str(previous_product_id) != str(review.product_id) or previous_rating != review.rating:
+            await _move_product_rating(db, (previous_product_id, previous_rating), (review.product_id, review.rating))
         await db.commit()
+        invalidate_product_cache(previous_product_id, review.product_id)
         await db.refresh(review)
         return review
     return None
 
 # Delete
 async def delete_review_service(db: AsyncSession, review_id: str) -> Optional[Review]:
-    review = await db.get(Review, review_id)
+    """Locks the review first, so a concurrent delete finds it gone instead of removing its rating twice"""
+    review = await db.get(Review, review_id, with_for_update=True)
     if review:
         await db.delete(review)
+        await _adjust_product_rating(db, review.product_id, review.rating, -1)
         await db.commit()
+        invalidate_product_cache(review.product_id)
         return review
     return None
\ No newline at end of file
@@ -1,9 +1,14 @@
-from typing import Optional, List
+import uuid
+from typing import Optional, List, Tuple
 
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.models.products import Warehouse, Product
+from app.api.utils.etag import row_version, version_etag
+from app.api.utils.pagination import Keyset, Page
+
+warehouse_keyset = Keyset(Warehouse.id)
 
 
 class WarehouseCreate(SQLModel):
@@ -26,14 +31,25 @@ async def create_warehouse_service(db: AsyncSession, warehouse: WarehouseCreate)
 
 
 # Read One
-async def get_warehouse_service(db: AsyncSession, warehouse_id: str) -> Optional[Warehouse]:
-    return await db.get(Warehouse, warehouse_id)
+async def get_warehouse_service(db: AsyncSession, warehouse_id: str) -> Optional[Tuple[Warehouse, str]]:
+    """A warehouse and its ETag, taken from the row version so a conditional hit is not serialized"""
+    try:
+        key = uuid.UUID(str(warehouse_id))
+    except ValueError:
+        return None
+    row = (await db.execute(select(Warehouse, row_version(Warehouse)).where(Warehouse.id == key))).first()
+    if row is None:
+        return None
+    warehouse, version = row
+    return warehouse, version_etag("warehouse", warehouse.id, version)
 
 
 # Read All
-async def get_warehouses_service(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Warehouse]:
-    warehouses = await db.execute(statement=select(Warehouse).offset(skip).limit(limit))
-    return warehouses.scalars().all()
+async def get_warehouses_service(db: AsyncSession, cursor: Optional[str] = None, skip: int = 0,
+                                 limit: int = 100) -> Page[Warehouse]:
+    statement = warehouse_keyset.apply(select(Warehouse), cursor=cursor, limit=limit, skip=skip)
+    warehouses = await db.execute(statement)
+    return warehouse_keyset.page(warehouses.scalars(), cursor=cursor, limit=limit, skip=skip)
 
 
 # Update
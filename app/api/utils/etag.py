@@ -0,0 +1,80 @@
+import hashlib
+from typing import Optional, Union
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, literal_column
+from starlette import status
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import Config
+
+
+def compute_etag(content: Union[str, bytes]) -> str:
+    """Strong ETag from the serialized representation, so it is identical across workers and restarts"""
+    if isinstance(content, str):
+        content = content.encode()
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def row_version(model) -> ColumnElement:
+    """
+    Postgres xmin of a model's row: the transaction that last wrote it. Every UPDATE changes it,
+    so selecting it next to the row gives a validator without serializing the row.
+    """
+    return literal_column(f"{model.__tablename__}.xmin")
+
+
+def version_etag(*parts) -> str:
+    """Strong ETag from the row ids, row versions and request parameters a representation is built from"""
+    return compute_etag("|".join(map(str, parts)))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so the weak tag sent to gzip clients still matches"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Same test GZipMiddleware uses to decide whether it may compress the response"""
+    return "gzip" in request.headers.get("accept-encoding", "")
+
+
+def cache_headers(request: Request, etag: str) -> dict:
+    """
+    Gzipped and identity bodies are different bytes, so they cannot share a strong tag. When the
+    client accepts gzip the tag is sent weak, on the 304 as on the 200 it revalidates. The check is
+    on the request, because a small body can go out uncompressed and a weak tag is still valid for it.
+    """
+    if accepts_gzip(request):
+        etag = f"W/{etag}"
+    return {"ETag": etag, "Cache-Control": Config.CATALOG_CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str) -> Response:
+    headers = cache_headers(request, etag)
+    # GZipMiddleware adds Vary to the compressed 200 only; the 304 needs it too
+    if accepts_gzip(request):
+        headers["Vary"] = "Accept-Encoding"
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def conditional_response(request: Request, model: BaseModel, etag: Optional[str] = None,
+                         include: Optional[Union[set, dict]] = None) -> Response:
+    """
+    JSON response with ETag and Cache-Control, or an empty 304 when the client already has it.
+    A precomputed etag (e.g. stored next to a cached object) is checked before serializing;
+    otherwise the body, trimmed to `include`, is serialized once and hashed.
+    """
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(request, etag)
+    body = model.model_dump_json(include=include)
+    etag = etag or compute_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(request, etag)
+    return Response(body, media_type="application/json", headers=cache_headers(request, etag))
@@ -0,0 +1,22 @@
+from typing import Iterable, Optional, Set
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Parses a comma-separated `?fields=` value into the set of requested fields; None means all.
+    `id` is always included so clients can key what they receive.
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | {"id"}
+
+
+def page_include(fields: Optional[Set[str]]) -> Optional[dict]:
+    """`include=` argument that trims every item of a Page to `fields` and keeps the cursors"""
+    if fields is None:
+        return None
+    return {"items": {"__all__": fields}, "next_cursor": True, "prev_cursor": True}
@@ -0,0 +1,99 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import literal, tuple_
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values: Sequence[Any], backwards: bool = False) -> str:
+    raw = json.dumps({"v": list(values), "b": backwards}, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[list, bool]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(data["v"]), bool(data["b"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+class Keyset:
+    """
+    Keyset (seek) pagination over an ordered, unique combination of columns.
+    The last column must make the key unique, usually the primary key.
+    """
+
+    def __init__(self, *columns, descending: bool = False):
+        self.columns = columns
+        self.descending = descending
+
+    def _coerce(self, values: list) -> list:
+        if len(values) != len(self.columns):
+            raise ValueError("Invalid cursor")
+        coerced = []
+        for column, value in zip(self.columns, values):
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                python_type = None
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            coerced.append(literal(value, type_=column.type))
+        return coerced
+
+    def _values(self, row) -> list:
+        if hasattr(row, "keys"):
+            return [row[column.key] for column in self.columns]
+        return [getattr(row, column.key) for column in self.columns]
+
+    def apply(self, statement, cursor: Optional[str] = None, limit: int = 100, skip: int = 0):
+        """Filters and orders the statement, fetching one extra row to detect a following page"""
+        backwards = False
+        if cursor:
+            values, backwards = decode_cursor(cursor)
+            key, bound = tuple_(*self.columns), tuple_(*self._coerce(values))
+            after = self.descending == backwards
+            statement = statement.where(key > bound if after else key < bound)
+        elif skip:
+            statement = statement.offset(skip)
+        descending = self.descending != backwards
+        order = [column.desc() if descending else column.asc() for column in self.columns]
+        return statement.order_by(*order).limit(limit + 1)
+
+    def page(self, rows, cursor: Optional[str] = None, limit: int = 100, skip: int = 0,
+             item: Optional[Callable[[Any], T]] = None) -> Page:
+        rows = list(rows)
+        backwards = decode_cursor(cursor)[1] if cursor else False
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+        next_cursor = prev_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = encode_cursor(self._values(rows[-1]))
+            if (has_more if backwards else bool(cursor or skip)):
+                prev_cursor = encode_cursor(self._values(rows[0]), backwards=True)
+        items = [item(row) for row in rows] if item else rows
+        return Page(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
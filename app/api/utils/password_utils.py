@@ -1,8 +1,25 @@
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 from passlib.context import CryptContext
 
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import Config
+from app.core.errors import ServerBusy
+
+# hashes below the configured cost are flagged by verify_and_update and rehashed on login
+password_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=Config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=Config.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL while hashing, so a small thread pool spreads the work across cores
+password_hash_executor = ThreadPoolExecutor(max_workers=Config.PASSWORD_HASH_WORKERS,
+                                            thread_name_prefix="password-hash")
+_pending_hash_jobs = 0
 
 
 
@@ -34,4 +51,29 @@ def get_hashed_password(password: str) -> str:
 
 
 def verify_password(password: str, hashed_pass: str) -> bool:
-    return password_context.verify(password, hashed_pass)
\ No newline at end of file
+    return password_context.verify(password, hashed_pass)
+
+
+async def _run_password_job(func, *args):
+    """
+    Runs a bcrypt call on the hashing pool so it never blocks the event loop.
+    Jobs beyond the workers plus PASSWORD_HASH_QUEUE_SIZE are rejected with ServerBusy.
+    """
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_QUEUE_SIZE:
+        raise ServerBusy("too many concurrent password checks")
+    _pending_hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_hash_executor, func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
+
+async def get_hashed_password_async(password: str) -> str:
+    return await _run_password_job(password_context.hash, password)
+
+
+async def verify_and_update_password_async(password: str, hashed_pass: str) -> tuple[bool, Optional[str]]:
+    """Returns whether the password matches and, if the stored hash is outdated, a replacement hash"""
+    return await _run_password_job(password_context.verify_and_update, password, hashed_pass)
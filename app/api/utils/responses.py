@@ -0,0 +1,13 @@
+from typing import Optional, Union
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+def model_response(model: BaseModel, status_code: int = 200, include: Optional[Union[set, dict]] = None) -> Response:
+    """
+    Serializes an already-built response model with pydantic-core directly. Returning a Response
+    skips FastAPI's second validation of the return value against response_model and its
+    jsonable_encoder pass; response_model stays on the route for the OpenAPI schema.
+    """
+    return Response(model.model_dump_json(include=include), status_code=status_code, media_type="application/json")
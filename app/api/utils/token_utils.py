@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Union, Any
+from typing import Union, Any, List, Optional
 
 from jose import jwt
 
@@ -12,10 +12,10 @@ JWT_SECRET_KEY = Config.JWT_SECRET_KEY
 JWT_REFRESH_SECRET_KEY = Config.JWT_REFRESH_SECRET_KEY
 
 
-def create_access_token(subject: Union[str, Any]) -> str:
+def create_access_token(subject: Union[str, Any], roles: Optional[List[str]] = None) -> str:
     expires_delta = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode = {"exp": expires_delta, "sub": str(subject)}
+    to_encode = {"exp": expires_delta, "sub": str(subject), "roles": roles or []}
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,41 @@
+"""
+Command line entry points, e.g.
+
+    python -m app.cli import-products catalog.csv
+"""
+import argparse
+import asyncio
+import os
+
+from app.api.models.products.product_request import CatalogFormat
+from app.api.services.product_import_service import create_product_import_service, run_product_import
+from app.core.db import async_session_maker
+
+
+async def import_products(path: str, import_format: CatalogFormat) -> None:
+    async with async_session_maker() as db:
+        job = await create_product_import_service(db, import_format)
+    print(f"import {job.id} started")
+    job = await run_product_import(job.id, path, import_format)
+    print(f"import {job.id} {job.status}: {job.processed_rows} rows processed, "
+          f"{job.inserted_rows} inserted, {job.error_rows} errors")
+    if job.message:
+        print(job.message)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import-products", help="bulk load a CSV or NDJSON product file")
+    import_command.add_argument("path")
+    import_command.add_argument("--format", choices=[f.value for f in CatalogFormat],
+                                help="defaults to the file extension")
+    args = parser.parse_args()
+
+    if args.command == "import-products":
+        import_format = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+        asyncio.run(import_products(args.path, CatalogFormat(import_format)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, ExpiredSignatureError, jwt
+from jose import JWTError, ExpiredSignatureError
 
-from app.core.config import Config
+from app.core.security import verify_access_token
 
 
 def get_id_from_token(token):
-    payload = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=Config.ALGORITHM)
+    payload = verify_access_token(token)
     user_id = payload.get('sub')
     return user_id
 
@@ -23,15 +23,14 @@ class AccessTokenBearer(HTTPBearer):
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Validate the token
+        # Validate the token once; downstream dependencies read the verified claims from request.state
         try:
-            payload = get_id_from_token(creds.credentials)
-            request.state.user = payload
-            print("payload"+ payload)
-            print("request"+ request.state.user)
+            claims = verify_access_token(creds.credentials)
+            request.state.token_claims = claims
+            request.state.user = claims.get('sub')
             return creds
         except JWTError as e:
-            if e is ExpiredSignatureError:
+            if isinstance(e, ExpiredSignatureError):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail= {"error":"Token has expired"},
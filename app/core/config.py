@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -24,6 +26,26 @@ class Settings(BaseSettings):
     AWS_REGION: str
     S3_BUCKET_NAME: str
     S3_FOLDER_NAME: str
+    PRODUCT_CACHE_SIZE: int = 10_000
+    PRODUCT_CACHE_TTL_SECONDS: float = 300
+    TOKEN_CACHE_SIZE: int = 10_000
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    QUERY_BUDGET_MODE: str = "off"
+    DEFAULT_QUERY_BUDGET: Optional[int] = None
+    CATALOG_CACHE_CONTROL: str = "public, no-cache"
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    PRODUCT_IMPORT_MAX_BYTES: int = 2 * 1024 ** 3
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
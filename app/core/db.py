@@ -1,12 +1,50 @@
+import time
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 
 from app.core.config import Config
 
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that also records how long checkouts wait for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
 async_engine = create_async_engine(
     url=Config.DATABASE_URL,
-    echo=True,
+    echo=Config.DB_ECHO,
+    poolclass=InstrumentedPool,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=Config.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=Config.DB_POOL_PRE_PING,
+    connect_args={
+        "prepared_statement_cache_size": Config.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {"statement_timeout": str(Config.DB_STATEMENT_TIMEOUT_MS)},
+    },
 )
 
 
@@ -17,6 +55,21 @@ async_session_maker = async_sessionmaker(
 )
 
 
+def pool_stats() -> dict:
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_seconds_total": pool.wait_seconds_total,
+        "wait_seconds_max": pool.wait_seconds_max,
+    }
+
+
 async def init_db() -> None:
     async with async_engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
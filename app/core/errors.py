@@ -4,6 +4,7 @@ This file consist of custom Exceptions for bustle spot application
 from typing import Callable, Any
 
 from fastapi import FastAPI
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette import status
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -99,6 +100,24 @@ class TaskNotFound(BustleSoptException):
     """
 
 
+class InsufficientStock(BustleSoptException):
+    """
+    if the warehouses together hold less stock than a checkout asks for
+    """
+
+
+class QueryBudgetExceeded(BustleSoptException):
+    """
+    if a request issued more SQL statements than its route's query budget (raised only in QUERY_BUDGET_MODE=raise)
+    """
+
+
+class ServerBusy(BustleSoptException):
+    """
+    if a bounded worker pool is saturated and the request is shed instead of queued
+    """
+
+
 def create_exception_handler(
         status_code: int, initial_detail: Any
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -246,6 +265,36 @@ def register_all_errors(app: FastAPI):
             }
         )
     )
+    app.add_exception_handler(
+        InsufficientStock,
+        create_exception_handler(
+            status_code=status.HTTP_409_CONFLICT,
+            initial_detail={
+                "message": "Not enough stock:",
+                "error_code": "insufficient_stock"
+            }
+        )
+    )
+    app.add_exception_handler(
+        ServerBusy,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Server is busy, please retry shortly",
+                "error_code": "server_busy"
+            }
+        )
+    )
+    app.add_exception_handler(
+        PoolTimeoutError,
+        create_exception_handler(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            initial_detail={
+                "message": "Database connection pool exhausted, please retry shortly",
+                "error_code": "db_pool_exhausted"
+            }
+        )
+    )
     app.add_exception_handler(
         SessionNotFound,
         create_exception_handler(
@@ -0,0 +1,174 @@
+"""
+Per-route request metrics in Prometheus text format: latency, SQL statement count,
+DB time and response size, keyed by route template rather than concrete path
+"""
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.cache import product_cache
+from app.core.db import async_engine, pool_stats
+from app.core.security import verified_token_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class RequestStats:
+    """Database work done on behalf of the current request, filled in by the engine hooks"""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.finished = False
+        self.statement_texts: Counter = Counter()
+        self.budget: Optional[int] = None
+
+
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    if stats is None or stats.finished:
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - context._metrics_started
+    stats.statement_texts[statement] += 1
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.responses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats,
+                response_bytes: int) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(seconds)
+        metrics.statements.observe(stats.statements)
+        metrics.db_seconds.observe(stats.db_seconds)
+        metrics.response_bytes.observe(response_bytes)
+        metrics.responses[status_code] = metrics.responses.get(status_code, 0) + 1
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so streaming responses are measured as they are sent.
+    Latency and DB stats stop at the last body chunk and exclude background tasks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        elapsed = None
+        status_code = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message):
+            nonlocal elapsed, status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    elapsed = time.perf_counter() - started
+                    stats.finished = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_request_stats.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            if elapsed is None:
+                elapsed = time.perf_counter() - started
+            registry.observe(scope["method"], route, status_code, elapsed, stats, response_bytes)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: list, name: str, help_text: str, attribute: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), metrics in sorted(registry.routes.items()):
+        histogram: Histogram = getattr(metrics, attribute)
+        labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def _render_gauges(lines: list, prefix: str, values: dict, help_text: str) -> None:
+    for key, value in values.items():
+        lines.append(f"# HELP {prefix}_{key} {help_text}")
+        lines.append(f"# TYPE {prefix}_{key} gauge")
+        lines.append(f"{prefix}_{key} {value}")
+
+
+def render_metrics() -> str:
+    lines = []
+    lines.append("# HELP http_requests_total Completed requests by route template and status")
+    lines.append("# TYPE http_requests_total counter")
+    for (method, route), metrics in sorted(registry.routes.items()):
+        for status_code, count in sorted(metrics.responses.items()):
+            lines.append(f'http_requests_total{{method="{_escape(method)}",route="{_escape(route)}",'
+                         f'status="{status_code}"}} {count}')
+    _render_histogram(lines, "http_request_duration_seconds", "Request latency until the last body chunk", "latency")
+    _render_histogram(lines, "http_request_db_statements", "SQL statements executed per request", "statements")
+    _render_histogram(lines, "http_request_db_duration_seconds", "Time spent in SQL per request", "db_seconds")
+    _render_histogram(lines, "http_response_size_bytes", "Response body size", "response_bytes")
+    _render_gauges(lines, "db_pool", pool_stats(), "Connection pool state")
+    _render_gauges(lines, "product_cache", product_cache.stats(), "Product detail cache state")
+    _render_gauges(lines, "token_cache", verified_token_cache.stats(), "Verified token cache state")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,111 @@
+"""
+Per-route SQL statement budgets, to catch N+1 queries before they ship.
+
+Routers declare a budget with `dependencies=[Depends(QueryBudget(n))]`; a budget declared on a
+single route runs after the router's and overrides it. QUERY_BUDGET_MODE decides what happens
+when a request goes over: "off" does nothing, "warn" logs (staging), "raise" fails the request (tests).
+"""
+import logging
+import re
+from collections import Counter
+
+from starlette.responses import JSONResponse
+
+from app.core.config import Config
+from app.core.errors import QueryBudgetExceeded
+from app.core.metrics import RequestStats, current_request_stats
+
+logger = logging.getLogger(__name__)
+
+REPORTED_SHAPES = 5
+SHAPE_LENGTH = 200
+
+_PARAMETER = r"\$\d+(?:::\w+)?"
+_PLACEHOLDER_LIST = re.compile(rf"{_PARAMETER}(?:\s*,\s*{_PARAMETER})*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudget:
+    """FastAPI dependency setting the maximum number of SQL statements the current request may issue"""
+
+    def __init__(self, max_statements: int):
+        self.max_statements = max_statements
+
+    async def __call__(self) -> None:
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.budget = self.max_statements
+
+
+def statement_shape(statement: str) -> str:
+    """Collapses bound parameter lists, so `IN ($1, $2)` and `IN ($1, $2, $3)` count as one shape"""
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("?", statement)).strip()
+
+
+def repeated_shapes(stats: RequestStats) -> list:
+    shapes = Counter()
+    for statement, count in stats.statement_texts.items():
+        shapes[statement_shape(statement)] += count
+    return [(shape, count) for shape, count in shapes.most_common(REPORTED_SHAPES) if count > 1]
+
+
+def check_query_budget(method: str, route: str, stats: RequestStats) -> None:
+    budget = stats.budget if stats.budget is not None else Config.DEFAULT_QUERY_BUDGET
+    if Config.QUERY_BUDGET_MODE == "off" or budget is None or stats.statements <= budget:
+        return
+    report = "".join(f"\n  {count}x {shape[:SHAPE_LENGTH]}" for shape, count in repeated_shapes(stats))
+    message = (f"{method} {route} issued {stats.statements} SQL statements, budget is {budget}."
+               f"{' Repeated statements:' + report if report else ''}")
+    if Config.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+class QueryBudgetMiddleware:
+    """
+    Checks the budget once the response is complete. Must sit inside MetricsMiddleware,
+    which owns the request stats; background tasks are not counted.
+    In raise mode the response is held back until the check, so an over-budget request
+    is answered with a 500 carrying the report instead of its normal response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or Config.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+        stats = current_request_stats.get()
+        if Config.QUERY_BUDGET_MODE != "raise":
+            await self.app(scope, receive, send)
+            if stats is not None:
+                check_query_budget(scope["method"], _route(scope), stats)
+            return
+
+        messages = []
+
+        async def hold(message):
+            messages.append(message)
+            last_chunk = message["type"] == "http.response.body" and not message.get("more_body", False)
+            if last_chunk and stats is not None:
+                # stop counting here, as MetricsMiddleware would, so background tasks are excluded
+                stats.finished = True
+
+        await self.app(scope, receive, hold)
+        try:
+            if stats is not None:
+                check_query_budget(scope["method"], _route(scope), stats)
+        except QueryBudgetExceeded as e:
+            response = JSONResponse(status_code=500, content={
+                "message": f"Query budget exceeded: {e}",
+                "error_code": "query_budget_exceeded",
+            })
+            await response(scope, receive, send)
+            return
+        for message in messages:
+            await send(message)
+
+
+def _route(scope) -> str:
+    return getattr(scope.get("route"), "path", None) or "unmatched"
@@ -0,0 +1,26 @@
+import hashlib
+import time
+
+from jose import jwt
+
+from app.core.cache import LRUCache
+from app.core.config import Config
+
+verified_token_cache = LRUCache(maxsize=Config.TOKEN_CACHE_SIZE, ttl=Config.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def verify_access_token(token: str) -> dict:
+    """
+    Verifies signature and expiry of an access token and returns its claims.
+    Verified claims are cached by token hash until the token's own exp,
+    so repeat requests with the same token skip signature verification.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = verified_token_cache.get(key)
+    if claims is not None:
+        return claims
+    claims = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=Config.ALGORITHM)
+    remaining = claims.get("exp", 0) - time.time()
+    if remaining > 0:
+        verified_token_cache.set(key, claims, ttl=remaining)
+    return claims
@@ -1,16 +1,36 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
 
+from app.core.config import Config
+from app.core.db import pool_stats
 from app.core.errors import register_all_errors
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_budget import QueryBudgetMiddleware
 from app.main_router import main_router
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 register_all_errors(app)
+# innermost, so the metrics middleware records compressed response sizes
+app.add_middleware(GZipMiddleware, minimum_size=Config.GZIP_MINIMUM_SIZE, compresslevel=Config.GZIP_COMPRESS_LEVEL)
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(main_router)
 
 
 @app.get("/")
 async def root():
     return JSONResponse(status_code=status.HTTP_200_OK, content={"message": f"currently server is running"})
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    return JSONResponse(status_code=status.HTTP_200_OK, content=pool_stats())
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
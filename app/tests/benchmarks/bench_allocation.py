@@ -0,0 +1,51 @@
+"""
+Warehouse allocation over synthetic inventories: times allocate() for carts of increasing size
+across increasing numbers of warehouses, with each product stocked in a random subset of them.
+Pure NumPy, no database needed. Splits and exact describe the last run of each shape.
+
+    python -m app.tests.benchmarks.bench_allocation [--repeat 5] [--seed 0]
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from app.api.services.allocation_service import allocate
+
+SHAPES = [(5, 10), (20, 10), (5, 40), (20, 40), (50, 40), (20, 100), (100, 100)]
+# share of (product, warehouse) pairs that hold any stock
+STOCKED_SHARE = 0.3
+
+
+def synthetic_inventory(rng: np.random.Generator, lines: int, warehouses: int):
+    stock = rng.integers(1, 20, size=(lines, warehouses)) * (rng.random((lines, warehouses)) < STOCKED_SHARE)
+    # every line stocked somewhere, and requested within what the warehouses hold together
+    stock[np.arange(lines), rng.integers(0, warehouses, size=lines)] += 5
+    requested = np.minimum(rng.integers(1, 15, size=lines), stock.sum(axis=1))
+    cost = rng.uniform(1, 10, size=warehouses)
+    return requested, stock, cost
+
+
+def main(repeat: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    print(f"{'lines':>6}{'warehouses':>12}{'median ms':>12}{'max ms':>10}{'splits':>8}{'exact':>7}")
+    for lines, warehouses in SHAPES:
+        timings = []
+        for _ in range(repeat):
+            requested, stock, cost = synthetic_inventory(rng, lines, warehouses)
+            started = time.perf_counter()
+            allocation, exact = allocate(requested, stock, cost)
+            timings.append(time.perf_counter() - started)
+            assert (allocation.sum(axis=1) == requested).all()
+        splits = int(allocation.any(axis=0).sum())
+        print(f"{lines:>6}{warehouses:>12}{statistics.median(timings) * 1000:>12.2f}{max(timings) * 1000:>10.2f}"
+              f"{splits:>8}{'yes' if exact else 'no':>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.tests.benchmarks.bench_allocation")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.repeat, args.seed)
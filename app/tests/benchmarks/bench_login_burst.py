@@ -0,0 +1,70 @@
+"""
+Event-loop latency during a login burst. A heartbeat task yields with asyncio.sleep(0) and records
+the gap between its ticks while BURST logins verify a bcrypt hash, once through the hashing pool
+(verify_and_update_password_async) and once by calling verify_password directly on the loop.
+No database is needed.
+
+    python -m app.tests.benchmarks.bench_login_burst [--burst 32]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.api.utils.password_utils import get_hashed_password, verify_password, verify_and_update_password_async
+
+PASSWORD = "Benchmark-password-1!"
+
+
+async def _heartbeat(stop: asyncio.Event, gaps: list) -> None:
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def _login_on_loop(hashed: str) -> None:
+    verify_password(PASSWORD, hashed)
+
+
+async def _login_on_pool(hashed: str) -> None:
+    await verify_and_update_password_async(PASSWORD, hashed)
+
+
+async def measure(login, burst: int, hashed: str) -> dict:
+    stop = asyncio.Event()
+    gaps = []
+    ticker = asyncio.create_task(_heartbeat(stop, gaps))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(login(hashed) for _ in range(burst)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    gaps.sort()
+    return {
+        "burst_seconds": elapsed,
+        "ticks": len(gaps),
+        "p50_gap_ms": statistics.median(gaps) * 1000,
+        "p99_gap_ms": gaps[int(len(gaps) * 0.99)] * 1000,
+        "max_gap_ms": gaps[-1] * 1000,
+    }
+
+
+async def main(burst: int) -> None:
+    hashed = get_hashed_password(PASSWORD)
+    print(f"{burst} concurrent logins")
+    print(f"{'path':<10}{'burst s':>10}{'ticks':>10}{'p50 gap ms':>12}{'p99 gap ms':>12}{'max gap ms':>12}")
+    for name, login in (("pool", _login_on_pool), ("on loop", _login_on_loop)):
+        result = await measure(login, burst, hashed)
+        print(f"{name:<10}{result['burst_seconds']:>10.3f}{result['ticks']:>10}{result['p50_gap_ms']:>12.3f}"
+              f"{result['p99_gap_ms']:>12.3f}{result['max_gap_ms']:>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.tests.benchmarks.bench_login_burst")
+    parser.add_argument("--burst", type=int, default=32,
+                        help="concurrent logins; keep within PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE")
+    asyncio.run(main(parser.parse_args().burst))
@@ -0,0 +1,94 @@
+"""
+Serializing a page of product cards: model_construct plus model_response, as the listing routes do,
+against FastAPI's own path for a route returning plain rows, which validates them against
+response_model, runs jsonable_encoder and renders with ORJSONResponse. Both start from the dict
+rows a query returns. No database needed.
+
+    python -m app.tests.benchmarks.bench_serialization [--repeat 20] [--seed 0]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.models.products.product_response import ProductCard
+from app.api.utils.pagination import Page
+from app.api.utils.responses import model_response
+
+SIZES = [100, 1_000, 10_000]
+
+
+def synthetic_rows(rng: random.Random, count: int) -> list:
+    """Mappings shaped like the product card query's rows"""
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "created_at": started + timedelta(seconds=index),
+            "name": f"Product {index}",
+            "price": round(rng.uniform(1, 500), 2),
+            "category_name": rng.choice(["Kitchen", "Garden", "Toys", None]),
+            "image": f"products/{index}.png" if rng.random() < 0.9 else None,
+            "average_rating": rng.uniform(1, 5) if rng.random() < 0.7 else None,
+            "review_count": rng.randint(0, 300),
+            "in_stock": rng.random() < 0.8,
+        }
+        for index in range(count)
+    ]
+
+
+async def construct_and_dump(rows: list) -> bytes:
+    page = Page(items=[ProductCard.model_construct(**row) for row in rows])
+    return model_response(page).body
+
+
+def response_model_path(field):
+    async def serialize(rows: list) -> bytes:
+        content = await serialize_response(field=field, response_content={"items": rows})
+        return ORJSONResponse(jsonable_encoder(content)).body
+    return serialize
+
+
+async def timed(serialize, rows: list, repeat: int) -> float:
+    """Median seconds per call"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await serialize(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def run(repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    field = create_model_field(name="Response_read_products", type_=Page[ProductCard], mode="serialization")
+    response_model = response_model_path(field)
+    print(f"{'products':>9}{'construct ms':>14}{'response_model ms':>19}{'speedup':>9}")
+    for size in SIZES:
+        rows = synthetic_rows(rng, size)
+        # same document either way, so only the cost differs
+        assert json.loads(await construct_and_dump(rows)) == json.loads(await response_model(rows))
+        constructed = await timed(construct_and_dump, rows, repeat)
+        validated = await timed(response_model, rows, repeat)
+        print(f"{size:>9}{constructed * 1000:>14.2f}{validated * 1000:>19.2f}{validated / constructed:>8.1f}x")
+
+
+def main(repeat: int, seed: int) -> None:
+    asyncio.run(run(repeat, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.tests.benchmarks.bench_serialization")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.repeat, args.seed)
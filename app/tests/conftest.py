@@ -0,0 +1,159 @@
+"""
+Shared test fixtures.
+
+Database tests run against TEST_DATABASE_URL, a database migrated to head. An empty database
+only needs `DATABASE_URL=$TEST_DATABASE_URL alembic upgrade head`: the baseline revision creates
+the schema, and the later ones add the triggers the tests rely on (so not create_all). The server
+needs the pg_trgm extension. The tests are skipped when the database is not configured or not
+reachable, so the pure unit tests and benchmarks run anywhere.
+"""
+import os
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from dotenv import dotenv_values
+
+# app.core.db builds its engine from DATABASE_URL on import, so point it at the test database first
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL") or dotenv_values(".env").get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+# a route going over its query budget fails the request under test
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, event  # noqa: E402
+from sqlalchemy.exc import SQLAlchemyError  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from app.api.models.cart.db.cart import Cart  # noqa: E402
+from app.api.models.orders import Order, OrderItem  # noqa: E402
+from app.api.models.products import Product, ProductCategory, ProductImage, Inventory, Warehouse, \
+    ProductRating, Review  # noqa: E402
+from app.api.models.user.db import User  # noqa: E402
+from app.api.models.user.principal import Principal  # noqa: E402
+from app.api.routes.user.user_service import get_current_principal  # noqa: E402
+from app.core.cache import product_cache  # noqa: E402
+from app.core.db import async_engine, async_session_maker  # noqa: E402
+from app.main import app  # noqa: E402
+
+# how many related rows the "dense" catalog product has of each kind; the "sparse" one has one
+DENSE_ROWS = 5
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@contextmanager
+def count_statements():
+    """Collects every SQL statement sent to the database inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def db():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    try:
+        async with async_engine.connect():
+            pass
+    except (OSError, SQLAlchemyError) as e:
+        pytest.skip(f"test database is not reachable: {e}")
+    async with async_session_maker() as session:
+        yield session
+    # pooled asyncpg connections are bound to this test's event loop
+    await async_engine.dispose()
+
+
+def new_user() -> User:
+    return User(email=f"test-{uuid.uuid4().hex[:12]}@example.com", hashed_password="x",
+                first_name="Test", last_name="User")
+
+
+async def delete_catalog(db, catalog) -> None:
+    user_ids = [catalog.user_id, *catalog.reviewer_ids]
+    product_ids = [catalog.sparse["product"], catalog.dense["product"]]
+    order_ids = (await db.execute(select(Order.id).where(Order.user_id.in_(user_ids)))).scalars().all()
+    await db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+    await db.execute(delete(Order).where(Order.id.in_(order_ids)))
+    await db.execute(delete(Cart).where(Cart.user_id.in_(user_ids)))
+    await db.execute(delete(Review).where(Review.product_id.in_(product_ids)))
+    await db.execute(delete(Inventory).where(Inventory.product_id.in_(product_ids)))
+    await db.execute(delete(ProductImage).where(ProductImage.product_id.in_(product_ids)))
+    await db.execute(delete(Product).where(Product.id.in_(product_ids)))
+    await db.execute(delete(Warehouse).where(Warehouse.id.in_(catalog.warehouse_ids)))
+    await db.execute(delete(ProductCategory).where(ProductCategory.id == catalog.category_id))
+    await db.execute(delete(User).where(User.id.in_(user_ids)))
+    await db.commit()
+
+
+@pytest.fixture
+async def catalog(db):
+    """
+    A buyer with both products in their cart, and two products: `sparse` with one image, review and
+    inventory row, and `dense` with DENSE_ROWS of each, so per-row queries show up as a count difference.
+    """
+    category = ProductCategory(name=f"test-{uuid.uuid4().hex[:8]}")
+    buyer = new_user()
+    reviewers = [new_user() for _ in range(DENSE_ROWS)]
+    warehouses = [Warehouse(name=f"test warehouse {index}") for index in range(DENSE_ROWS)]
+    db.add(category)
+    db.add_all([buyer, *reviewers, *warehouses])
+    await db.flush()
+
+    ids = {}
+    for name, rows in (("sparse", 1), ("dense", DENSE_ROWS)):
+        product = Product(name=f"Test widget {name}", description="a test product", price=10.0,
+                          category_id=category.id)
+        db.add(product)
+        await db.flush()
+        images = [ProductImage(product_id=product.id, image=f"{name}-{index}.png", primary_image=index == 0)
+                  for index in range(rows)]
+        reviews = [Review(product_id=product.id, reviewer_id=reviewer.id, rating=4, review_message="fine")
+                   for reviewer in reviewers[:rows]]
+        inventories = [Inventory(product_id=product.id, warehouse_id=warehouse.id, quantity=10)
+                       for warehouse in warehouses[:rows]]
+        db.add_all([*images, *reviews, *inventories])
+        db.add(ProductRating(product_id=product.id, review_count=rows, rating_sum=4 * rows, rating_4=rows))
+        db.add(Cart(user_id=buyer.id, product_id=product.id, quantity=1))
+        ids[name] = {"product": product.id, "image": images[0].id, "review": reviews[0].id,
+                     "inventory": inventories[0].id, "warehouse": warehouses[0].id}
+    await db.commit()
+    product_cache.clear()
+
+    catalog = SimpleNamespace(user_id=buyer.id, reviewer_ids=[reviewer.id for reviewer in reviewers],
+                              warehouse_ids=[warehouse.id for warehouse in warehouses],
+                              category_id=category.id, **ids)
+    yield catalog
+    await delete_catalog(db, catalog)
+    product_cache.clear()
+
+
+@pytest.fixture
+async def principal_client():
+    """HTTP client authenticated as a principal with no rows behind it, for tests that never reach the database"""
+    app.dependency_overrides[get_current_principal] = lambda: Principal(id=uuid.uuid4())
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def client(catalog):
+    """HTTP client for the app, authenticated as the catalog's buyer"""
+    app.dependency_overrides[get_current_principal] = lambda: Principal(id=catalog.user_id)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
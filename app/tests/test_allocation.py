@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.api.services import allocation_service
+from app.api.services.allocation_service import allocate, _exact_warehouses, _greedy_warehouses
+
+
+def test_fewest_warehouses_win_over_cost():
+    requested = np.array([5, 5])
+    # warehouse 2 covers both lines alone; 0 and 1 together cover them more cheaply
+    stock = np.array([[5, 0, 5],
+                      [0, 5, 5]])
+    cost = np.array([1.0, 1.0, 10.0])
+
+    allocation, exact = allocate(requested, stock, cost)
+
+    assert exact
+    assert np.flatnonzero(allocation.any(axis=0)).tolist() == [2]
+
+
+def test_cheapest_set_among_equal_split_counts():
+    requested = np.array([2, 2])
+    stock = np.array([[2, 2, 2],
+                      [2, 2, 2]])
+    cost = np.array([3.0, 1.0, 2.0])
+
+    assert _exact_warehouses(requested, stock, cost).tolist() == [1]
+
+
+def test_lines_split_fill_the_cheapest_warehouse_first():
+    requested = np.array([6])
+    stock = np.array([[4, 4]])
+    cost = np.array([2.0, 1.0])
+
+    allocation, exact = allocate(requested, stock, cost)
+
+    assert exact
+    assert allocation.tolist() == [[2, 4]]
+
+
+def test_greedy_fallback_past_max_exact_combinations(monkeypatch):
+    monkeypatch.setattr(allocation_service, "MAX_EXACT_COMBINATIONS", 2)
+    requested = np.array([3, 3])
+    stock = np.array([[3, 0, 1],
+                      [0, 3, 1]])
+    cost = np.zeros(3)
+
+    assert _exact_warehouses(requested, stock, cost) is None
+    allocation, exact = allocate(requested, stock, cost)
+
+    assert not exact
+    assert allocation.sum(axis=1).tolist() == [3, 3]
+
+
+def test_greedy_fallback_when_more_than_max_exact_splits_are_needed():
+    lines = allocation_service.MAX_EXACT_SPLITS + 1
+    requested = np.ones(lines, dtype=np.int64)
+    # every line is only stocked in its own warehouse
+    stock = np.eye(lines, dtype=np.int64)
+
+    allocation, exact = allocate(requested, stock, np.zeros(lines))
+
+    assert not exact
+    assert (allocation == stock).all()
+
+
+def test_greedy_takes_the_widest_coverage_first_then_the_cheapest():
+    requested = np.array([2, 2, 2, 2])
+    stock = np.array([[2, 0, 0],
+                      [2, 0, 0],
+                      [2, 0, 0],
+                      [0, 2, 2]])
+    cost = np.array([5.0, 3.0, 1.0])
+
+    # warehouse 0 covers the most units despite its cost; the last line then goes to the cheaper of 1 and 2
+    assert _greedy_warehouses(requested, stock, cost).tolist() == [0, 2]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_allocation_covers_requests_within_stock(seed):
+    rng = np.random.default_rng(seed)
+    lines, warehouses = rng.integers(1, 12), rng.integers(1, 25)
+    stock = rng.integers(0, 6, size=(lines, warehouses)) * (rng.random((lines, warehouses)) < 0.4)
+    requested = np.minimum(rng.integers(1, 10, size=lines), stock.sum(axis=1))
+    cost = rng.random(warehouses)
+
+    allocation, _ = allocate(requested, stock, cost)
+
+    assert (allocation.sum(axis=1) == requested).all()
+    assert ((allocation >= 0) & (allocation <= stock)).all()
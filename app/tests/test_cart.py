@@ -0,0 +1,27 @@
+import uuid
+
+import pytest
+
+from app.api.models.cart.cart_request import CART_CHANGES_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cart_patch_over_limit_is_rejected(principal_client):
+    changes = [{"product_id": str(uuid.uuid4()), "quantity": 1} for _ in range(CART_CHANGES_LIMIT + 1)]
+
+    response = await principal_client.patch("/cart/", json=changes)
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+async def test_cart_patch_sets_absolute_quantities(client, catalog):
+    changes = [{"product_id": str(catalog.sparse["product"]), "quantity": 3},
+               {"product_id": str(catalog.dense["product"]), "quantity": 0}]
+
+    response = await client.patch("/cart/", json=changes)
+
+    assert response.status_code == 200, response.text
+    assert [(line["product_id"], line["quantity"]) for line in response.json()] == \
+        [(str(catalog.sparse["product"]), 3)]
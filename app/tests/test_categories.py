@@ -0,0 +1,31 @@
+import pytest
+
+from app.api.models.products import ProductCategory
+from app.core.cache import product_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_category_delete_drops_cached_products(client, catalog, db):
+    detail = await client.get(f"/products/{catalog.sparse['product']}")
+    assert detail.status_code == 200
+    assert len(product_cache) == 1
+
+    category = ProductCategory(name="test-empty-category")
+    db.add(category)
+    await db.commit()
+    response = await client.delete(f"/category/delete?category_id={category.id}")
+
+    assert response.status_code == 204, response.text
+    assert len(product_cache) == 0
+
+
+async def test_category_with_products_is_not_deleted(client, catalog, db):
+    response = await client.delete(f"/category/delete?category_id={catalog.category_id}")
+    assert response.status_code == 409, response.text
+    assert await db.get(ProductCategory, catalog.category_id) is not None
+
+
+async def test_unknown_category_is_404(client, catalog):
+    response = await client.delete("/category/delete?category_id=-1")
+    assert response.status_code == 404
@@ -0,0 +1,102 @@
+"""
+Concurrency stress test for checkout: more buyers than stock, all checking out at once.
+Every cart holds two products, so the multi-product path and its lock ordering are exercised too.
+"""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, func, text
+from sqlmodel import select
+
+from app.api.models.cart.db.cart import Cart
+from app.api.models.orders import Order, OrderItem
+from app.api.models.orders.order_response import OrderRead
+from app.api.models.products import Product, ProductCategory, ProductStock, Inventory, Warehouse
+from app.api.models.user.db import User
+from app.api.services.order_service import checkout_service, _reserve_stock
+from app.core.db import async_session_maker
+from app.core.errors import InsufficientStock
+from app.tests.conftest import new_user
+
+pytestmark = pytest.mark.anyio
+
+BUYERS = 20
+# units per warehouse; every buyer wants one of the first product and two of the second,
+# so both sell out after exactly ORDERS checkouts
+STOCK = {"single": (4, 3, 3), "double": (8, 6, 6)}
+ORDERS = 10
+
+
+@pytest.fixture
+async def contested_stock(db):
+    category = ProductCategory(name=f"test-{uuid.uuid4().hex[:8]}")
+    buyers = [new_user() for _ in range(BUYERS)]
+    warehouses = [Warehouse(name=f"test warehouse {index}") for index in range(3)]
+    db.add(category)
+    db.add_all([*buyers, *warehouses])
+    await db.flush()
+    products = {name: Product(name=f"Test contested {name}", price=5.0, category_id=category.id) for name in STOCK}
+    db.add_all(products.values())
+    await db.flush()
+    for name, quantities in STOCK.items():
+        db.add_all([Inventory(product_id=products[name].id, warehouse_id=warehouse.id, quantity=quantity)
+                    for warehouse, quantity in zip(warehouses, quantities)])
+    for buyer in buyers:
+        db.add(Cart(user_id=buyer.id, product_id=products["single"].id, quantity=1))
+        db.add(Cart(user_id=buyer.id, product_id=products["double"].id, quantity=2))
+    await db.commit()
+
+    buyer_ids = [buyer.id for buyer in buyers]
+    product_ids = {name: product.id for name, product in products.items()}
+    yield buyer_ids, product_ids
+
+    order_ids = select(Order.id).where(Order.user_id.in_(buyer_ids))
+    await db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+    await db.execute(delete(Order).where(Order.user_id.in_(buyer_ids)))
+    await db.execute(delete(Product).where(Product.id.in_(product_ids.values())))
+    await db.execute(delete(Warehouse).where(Warehouse.id.in_([warehouse.id for warehouse in warehouses])))
+    await db.execute(delete(ProductCategory).where(ProductCategory.id == category.id))
+    await db.execute(delete(User).where(User.id.in_(buyer_ids)))
+    await db.commit()
+
+
+async def _checkout(user_id: uuid.UUID):
+    async with async_session_maker() as session:
+        return await checkout_service(session, user_id)
+
+
+async def test_concurrent_checkouts_never_oversell(db, contested_stock):
+    buyer_ids, product_ids = contested_stock
+
+    results = await asyncio.gather(*(_checkout(user_id) for user_id in buyer_ids), return_exceptions=True)
+
+    unexpected = [result for result in results if not isinstance(result, (OrderRead, InsufficientStock))]
+    assert unexpected == []
+    assert sum(isinstance(result, OrderRead) for result in results) == ORDERS
+    for name, product_id in product_ids.items():
+        sold = await db.scalar(select(func.sum(OrderItem.quantity)).where(OrderItem.product_id == product_id))
+        assert sold == sum(STOCK[name])
+        quantities = (await db.execute(
+            select(Inventory.quantity).where(Inventory.product_id == product_id)
+        )).scalars().all()
+        assert all(quantity >= 0 for quantity in quantities)
+        assert await db.scalar(
+            select(ProductStock.quantity).where(ProductStock.product_id == product_id)
+        ) == sum(quantities) == 0
+    # failed checkouts leave the cart untouched
+    remaining = await db.scalar(select(func.count()).select_from(Cart).where(Cart.user_id.in_(buyer_ids)))
+    assert remaining == 2 * (BUYERS - ORDERS)
+
+
+async def test_checkout_takes_a_free_warehouse_row_instead_of_waiting(contested_stock):
+    buyer_ids, product_ids = contested_stock
+    async with async_session_maker() as holding:
+        # an uncommitted checkout holding the fullest row of each product
+        await _reserve_stock(holding, {product_ids["single"]: 1, product_ids["double"]: 2})
+        async with async_session_maker() as session:
+            # any wait on a row lock fails the checkout instead of blocking the test
+            await session.execute(text("SET LOCAL lock_timeout = '1s'"))
+            order = await checkout_service(session, buyer_ids[0])
+        await holding.rollback()
+    assert {item.product_id for item in order.items} == set(product_ids.values())
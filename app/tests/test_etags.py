@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import update
+
+from app.api.models.products import Product
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+# paths with an ETag checked before the body is serialized; ids are filled from catalog.sparse
+CONDITIONAL_ROUTES = [
+    "/products/",
+    "/products/?fields=name,price",
+    "/products/{product}",
+    "/warehouses/{warehouse}",
+    "/product-images/{image}",
+]
+
+
+@pytest.mark.parametrize("path", CONDITIONAL_ROUTES)
+async def test_conditional_get_skips_serialization(client, catalog, monkeypatch, path):
+    path = path.format(**catalog.sparse)
+    response = await client.get(path)
+    assert response.status_code == 200, response.text
+    etag = response.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("serialized for a conditional hit")
+
+    monkeypatch.setattr("pydantic.BaseModel.model_dump_json", fail)
+    with count_statements() as statements:
+        response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert len(statements) <= 1, "\n".join(statements)
+
+
+async def test_warehouse_etag_changes_with_row(client, catalog):
+    path = f"/warehouses/{catalog.sparse['warehouse']}"
+    etag = (await client.get(path)).headers["etag"]
+
+    response = await client.put(path, json={"address": "1 New Street"})
+    assert response.status_code == 200, response.text
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["address"] == "1 New Street"
+    assert response.headers["etag"] != etag
+
+
+async def test_listing_etag_changes_with_card(client, catalog, db):
+    etag = (await client.get("/products/")).headers["etag"]
+
+    await db.execute(update(Product).where(Product.id == catalog.sparse["product"]).values(price=11.0))
+    await db.commit()
+
+    response = await client.get("/products/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.headers["etag"] != (await client.get("/products/?limit=5")).headers["etag"]
+
+
+async def test_unknown_ids_are_404(client):
+    for path in ("/warehouses/not-a-uuid", "/product-images/not-a-uuid"):
+        assert (await client.get(path)).status_code == 404
+
+
+async def test_etag_is_weak_when_body_may_be_gzipped(client, catalog):
+    path = "/products/"
+    identity = await client.get(path, headers={"Accept-Encoding": "identity"})
+    gzipped = await client.get(path, headers={"Accept-Encoding": "gzip"})
+    # the tag is weak whether or not this body reaches GZIP_MINIMUM_SIZE
+    assert "content-encoding" not in identity.headers
+
+    strong, weak = identity.headers["etag"], gzipped.headers["etag"]
+    assert not strong.startswith("W/")
+    assert weak == f"W/{strong}"
+
+    response = await client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": weak})
+    assert response.status_code == 304
+    assert (response.headers["etag"], response.headers["vary"]) == (weak, "Accept-Encoding")
+    response = await client.get(path, headers={"Accept-Encoding": "identity", "If-None-Match": weak})
+    assert (response.status_code, response.headers["etag"]) == (304, strong)
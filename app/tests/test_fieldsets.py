@@ -0,0 +1,68 @@
+"""`?fields=` trims both the JSON and the SQL behind it"""
+import pytest
+
+from app.core.cache import product_cache
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+# tables a product card or detail reads besides products
+RELATED_TABLES = ("product_categories", "product_images", "product_stock", "product_ratings")
+
+
+async def get_trimmed(client, path):
+    product_cache.clear()
+    with count_statements() as statements:
+        response = await client.get(path)
+    assert response.status_code == 200, response.text
+    return response.json(), "\n".join(statements)
+
+
+async def test_detail_fields(client, catalog):
+    product = catalog.dense["product"]
+
+    body, sql = await get_trimmed(client, f"/products/{product}?fields=name,price")
+    assert set(body) == {"id", "name", "price"}
+    assert not any(table in sql for table in RELATED_TABLES), sql
+
+    body, sql = await get_trimmed(client, f"/products/{product}?fields=images")
+    assert set(body) == {"id", "images"}
+    assert len(body["images"]) == 5
+    assert "product_images" in sql and "product_categories" not in sql, sql
+
+
+async def test_listing_fields(client, catalog):
+    body, sql = await get_trimmed(client, "/products/?fields=name,price")
+    assert body["items"]
+    assert all(set(item) == {"id", "name", "price"} for item in body["items"])
+    assert not any(table in sql for table in RELATED_TABLES), sql
+
+    body, sql = await get_trimmed(client, "/products/?fields=in_stock")
+    assert all(set(item) == {"id", "in_stock"} for item in body["items"])
+    assert "product_stock" in sql and "product_ratings" not in sql, sql
+
+    _, sql = await get_trimmed(client, "/products/")
+    assert all(table in sql for table in RELATED_TABLES), sql
+
+
+async def test_search_fields(client, catalog):
+    body, sql = await get_trimmed(client, "/products/name/?name=widget&fields=name")
+    assert body["items"]
+    assert all(set(item) == {"id", "name"} for item in body["items"])
+    assert "ts_headline" not in sql
+    assert not any(table in sql for table in RELATED_TABLES), sql
+
+    body, sql = await get_trimmed(client, "/products/name/?name=widget&fields=name,snippet")
+    assert all(set(item) == {"id", "name", "snippet"} for item in body["items"])
+    assert "ts_headline" in sql
+
+    _, sql = await get_trimmed(client, "/products/name/?name=widget")
+    assert "ts_headline" in sql
+
+
+@pytest.mark.parametrize("path", ["/products/{product}", "/products/", "/products/name/?name=widget"])
+async def test_unknown_fields_are_400(client, catalog, path):
+    separator = "&" if "?" in path else "?"
+    response = await client.get(f"{path.format(**catalog.sparse)}{separator}fields=name,secret")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: secret"
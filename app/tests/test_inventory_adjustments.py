@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from app.api.models.products import InventorySync
+from app.api.services.Inventory_service import ADJUSTMENT_BATCH_LIMIT
+
+pytestmark = pytest.mark.anyio
+
+
+def change(product_id, warehouse_id, **amount) -> dict:
+    return {"product_id": str(product_id), "warehouse_id": str(warehouse_id), **amount}
+
+
+async def adjust(client, adjustments, sync_id=None) -> dict:
+    response = await client.post("/inventory/adjustments", json={"sync_id": sync_id, "adjustments": adjustments})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def stock(client, product_id) -> int:
+    response = await client.get(f"/inventory/availability?product_ids={product_id}")
+    return response.json()[0]["quantity"]
+
+
+@pytest.fixture
+async def sync_id(db):
+    sync_id = f"test-{uuid.uuid4().hex}"
+    yield sync_id
+    await db.execute(delete(InventorySync).where(InventorySync.sync_id == sync_id))
+    await db.commit()
+
+
+async def test_batch_applies_deltas_and_absolutes(client, catalog):
+    sparse, dense = catalog.sparse, catalog.dense
+    body = await adjust(client, [
+        change(sparse["product"], sparse["warehouse"], delta=-3),
+        change(dense["product"], catalog.warehouse_ids[1], quantity=20),
+        change(sparse["product"], sparse["warehouse"], delta=1),
+    ])
+    assert [(result["status"], result["quantity"]) for result in body["results"]] == \
+           [("updated", 8), ("updated", 20), ("updated", 8)]
+    assert await stock(client, sparse["product"]) == 8
+    assert await stock(client, dense["product"]) == 10 * 4 + 20
+
+
+async def test_missing_pairs_are_inserted(client, catalog):
+    sparse = catalog.sparse
+    body = await adjust(client, [
+        change(sparse["product"], catalog.warehouse_ids[1], quantity=4),
+        change(sparse["product"], catalog.warehouse_ids[2], delta=2),
+        change(uuid.uuid4(), catalog.warehouse_ids[1], quantity=1),
+    ])
+    assert [(result["status"], result["quantity"]) for result in body["results"]] == \
+           [("created", 4), ("created", 2), ("rejected", None)]
+    assert body["results"][2]["message"] == "Product or warehouse not found"
+    assert await stock(client, sparse["product"]) == 10 + 4 + 2
+
+
+async def test_negative_results_are_rejected(client, catalog):
+    sparse = catalog.sparse
+    body = await adjust(client, [
+        change(sparse["product"], sparse["warehouse"], delta=-11),
+        change(sparse["product"], catalog.warehouse_ids[1], delta=-1),
+        change(catalog.dense["product"], catalog.dense["warehouse"], delta=-10),
+    ])
+    assert [(result["status"], result["message"]) for result in body["results"]] == [
+        ("rejected", "Quantity would go negative"),
+        ("rejected", "Quantity would go negative"),
+        ("updated", None),
+    ]
+    assert await stock(client, sparse["product"]) == 10
+
+
+async def test_replayed_sync_applies_once(client, catalog, sync_id):
+    adjustments = [change(catalog.sparse["product"], catalog.sparse["warehouse"], delta=-2)]
+    first = await adjust(client, adjustments, sync_id=sync_id)
+    second = await adjust(client, adjustments, sync_id=sync_id)
+    assert (first["replayed"], second["replayed"]) == (False, True)
+    assert second["results"] == first["results"]
+    assert await stock(client, catalog.sparse["product"]) == 8
+
+
+async def test_batch_over_limit_is_422(client, catalog):
+    adjustments = [change(catalog.sparse["product"], catalog.sparse["warehouse"], delta=0)] \
+        * (ADJUSTMENT_BATCH_LIMIT + 1)
+    response = await client.post("/inventory/adjustments", json={"adjustments": adjustments})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "too_long"
+
+
+async def test_overlapping_syncs_do_not_deadlock(client, catalog):
+    pairs = [(product, warehouse) for product in (catalog.sparse["product"], catalog.dense["product"])
+             for warehouse in catalog.warehouse_ids[:2]]
+    for _ in range(5):
+        forward = [change(*pair, delta=1) for pair in pairs]
+        responses = await asyncio.gather(
+            client.post("/inventory/adjustments", json={"adjustments": forward}),
+            client.post("/inventory/adjustments", json={"adjustments": forward[::-1]}),
+        )
+        assert [response.status_code for response in responses] == [200, 200]
+    assert await stock(client, catalog.sparse["product"]) == 10 + 2 * 2 * 5
@@ -0,0 +1,27 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+# listing path, largest page it serves
+PAGED_ROUTES = [
+    ("/products/", 500),
+    ("/products/name/?name=widget", 500),
+    (f"/products/{uuid.uuid4()}/reviews", 100),
+    ("/warehouses/", 500),
+    ("/product-images/", 500),
+    ("/inventory/", 500),
+    (f"/products/imports/{uuid.uuid4()}/errors", 500),
+    ("/orders/", 100),
+]
+
+
+@pytest.mark.parametrize("path, largest", PAGED_ROUTES)
+@pytest.mark.parametrize("bound", ["negative", "zero", "over"])
+async def test_out_of_range_limit_is_rejected(principal_client, path, largest, bound):
+    limit = {"negative": -1, "zero": 0, "over": largest + 1}[bound]
+    separator = "&" if "?" in path else "?"
+    response = await principal_client.get(f"{path}{separator}limit={limit}")
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"][0]["loc"] == ["query", "limit"]
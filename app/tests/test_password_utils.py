@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from passlib.hash import bcrypt
+
+from app.api.utils import password_utils
+from app.api.utils.password_utils import get_hashed_password, verify_and_update_password_async
+from app.core.config import Config
+from app.core.errors import ServerBusy
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_burst_beyond_pool_and_queue_is_rejected(monkeypatch):
+    monkeypatch.setattr(Config, "PASSWORD_HASH_QUEUE_SIZE", 2)
+    limit = Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_QUEUE_SIZE
+    hashed = get_hashed_password("Secret-1!")
+
+    results = await asyncio.gather(
+        *(verify_and_update_password_async("Secret-1!", hashed) for _ in range(limit + 3)),
+        return_exceptions=True,
+    )
+
+    assert [result for result in results if isinstance(result, ServerBusy)] == results[limit:]
+    assert all(result == (True, None) for result in results[:limit])
+    assert password_utils._pending_hash_jobs == 0
+
+
+async def test_outdated_hash_is_replaced_on_login():
+    weak = bcrypt.using(rounds=4).hash("Secret-1!")
+
+    matches, replacement = await verify_and_update_password_async("Secret-1!", weak)
+
+    assert matches
+    assert replacement is not None
+    assert password_utils.password_context.needs_update(replacement) is False
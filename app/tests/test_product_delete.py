@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.api.models.cart.db.cart import Cart
+from app.api.models.orders import Order, OrderItem
+from app.api.models.products import Product, ProductImage, Inventory, Review
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_delete_product_removes_child_rows(client, catalog, db):
+    product_id = catalog.dense["product"]
+    with count_statements() as statements:
+        response = await client.delete(f"/products/{product_id}")
+    assert response.status_code == 204, response.text
+    # loads the product and deletes it; children are removed by the database, not loaded
+    assert len(statements) == 2, "\n".join(statements)
+    for model in (Product, ProductImage, Review, Inventory, Cart):
+        column = model.id if model is Product else model.product_id
+        assert await db.scalar(select(func.count()).where(column == product_id)) == 0
+
+
+async def test_delete_ordered_product_conflicts(client, catalog, db):
+    product_id = catalog.sparse["product"]
+    order = Order(user_id=catalog.user_id, total=10.0)
+    db.add(order)
+    db.add(OrderItem(order_id=order.id, product_id=product_id, warehouse_id=catalog.sparse["warehouse"],
+                     quantity=1, unit_price=10.0))
+    await db.commit()
+
+    response = await client.delete(f"/products/{product_id}")
+    assert response.status_code == 409, response.text
+    assert await db.get(Product, product_id) is not None
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.api.models.products import Product, ProductImport, ProductImportError
+from app.core.config import Config
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def spool_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    return tmp_path
+
+
+async def test_declared_body_over_limit_is_rejected_before_reading(principal_client, spool_dir, monkeypatch):
+    monkeypatch.setattr(Config, "PRODUCT_IMPORT_MAX_BYTES", 16)
+
+    response = await principal_client.post("/products/imports/?format=ndjson", content=b"x" * 17)
+
+    assert response.status_code == 413
+    assert list(spool_dir.iterdir()) == []
+
+
+async def test_streamed_body_over_limit_is_rejected_and_spool_removed(principal_client, spool_dir, monkeypatch):
+    monkeypatch.setattr(Config, "PRODUCT_IMPORT_MAX_BYTES", 16)
+
+    async def body():
+        for _ in range(4):
+            yield b"x" * 8
+
+    # no Content-Length, so the limit is only found while spooling
+    response = await principal_client.post("/products/imports/?format=ndjson", content=body())
+
+    assert response.status_code == 413
+    assert list(spool_dir.iterdir()) == []
+
+
+@pytest.fixture
+async def imports(catalog, db):
+    """Collects the ids of imports a test runs; their products, errors and jobs are removed afterwards"""
+    import_ids = []
+    yield import_ids
+    await db.execute(delete(Product).where(Product.category_id == catalog.category_id,
+                                           Product.name.like("Imported %")))
+    await db.execute(delete(ProductImportError).where(ProductImportError.import_id.in_(import_ids)))
+    await db.execute(delete(ProductImport).where(ProductImport.id.in_(import_ids)))
+    await db.commit()
+
+
+async def run_import(client, imports, import_format: str, body: str) -> dict:
+    # the background task runs before the test client returns the response
+    response = await client.post(f"/products/imports/?format={import_format}", content=body.encode())
+    assert response.status_code == 202, response.text
+    imports.append(response.json()["id"])
+    job = (await client.get(f"/products/imports/{imports[-1]}")).json()
+    errors = (await client.get(f"/products/imports/{imports[-1]}/errors")).json()["items"]
+    return {"job": job, "errors": {error["row_number"]: error["message"] for error in errors}}
+
+
+async def imported_names(db, catalog) -> set:
+    names = await db.execute(select(Product.name).where(Product.category_id == catalog.category_id,
+                                                        Product.name.like("Imported %")))
+    return set(names.scalars())
+
+
+async def test_csv_import_merges_good_rows_and_records_bad_ones(client, catalog, db, imports, spool_dir,
+                                                                monkeypatch):
+    monkeypatch.setattr("app.api.services.product_import_service.IMPORT_CHUNK_SIZE", 2)
+    body = ("name,description,price,category_id\n"
+            f"Imported lamp,a lamp,12.5,{catalog.category_id}\n"
+            f"Imported chair,,not a price,{catalog.category_id}\n"
+            "Imported desk,a desk,80,-1\n"
+            f"Imported rug,a rug,40,{catalog.category_id}\n")
+
+    result = await run_import(client, imports, "csv", body)
+
+    job = result["job"]
+    assert (job["status"], job["processed_rows"], job["inserted_rows"], job["error_rows"]) == ("completed", 4, 2, 2)
+    assert sorted(result["errors"]) == [2, 3]
+    assert "price" in result["errors"][2]
+    assert result["errors"][3] == "Category not found: -1"
+    assert await imported_names(db, catalog) == {"Imported lamp", "Imported rug"}
+    assert list(spool_dir.iterdir()) == []
+
+
+async def test_ndjson_import_merges_good_rows_and_records_bad_ones(client, catalog, db, imports, spool_dir):
+    good = {"name": "Imported kettle", "price": 30, "category_id": catalog.category_id}
+    body = "\n".join([
+        json.dumps(good),
+        "{not json",
+        json.dumps({"price": 5, "category_id": catalog.category_id}),
+        "",
+        json.dumps([1, 2]),
+    ]) + "\n"
+
+    result = await run_import(client, imports, "ndjson", body)
+
+    job = result["job"]
+    assert (job["status"], job["processed_rows"], job["inserted_rows"], job["error_rows"]) == ("completed", 4, 1, 3)
+    assert result["errors"][2] == result["errors"][5] == "Malformed record"
+    assert "name" in result["errors"][3]
+    assert await imported_names(db, catalog) == {"Imported kettle"}
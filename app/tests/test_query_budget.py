@@ -0,0 +1,87 @@
+import uuid
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy import delete
+from sqlmodel import select
+
+from app.api.models.cart.db.cart import Cart
+from app.api.models.orders import Order, OrderItem
+from app.api.models.products import Product, Inventory
+from app.core.config import Config
+from app.core.db import get_db
+from app.core.metrics import MetricsMiddleware
+from app.core.query_budget import QueryBudget, QueryBudgetMiddleware, statement_shape
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+
+def test_statement_shape_collapses_parameter_lists():
+    assert statement_shape("SELECT a FROM t WHERE id IN ($1::UUID, $2::UUID,\n  $3::UUID)") == \
+        statement_shape("SELECT a FROM t WHERE id IN ($1::UUID)") == "SELECT a FROM t WHERE id IN (?)"
+
+
+def budget_app() -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(dependencies=[Depends(QueryBudget(2))])
+
+    @router.get("/products/{count}")
+    async def read_one_by_one(count: int, db=Depends(get_db)):
+        for _ in range(count):
+            await db.execute(select(Product.name).where(Product.id == uuid.uuid4()))
+        return {"read": count}
+
+    app.include_router(router)
+    app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+@pytest.fixture
+async def budget_client(db):
+    transport = httpx.ASGITransport(app=budget_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_route_within_budget_is_answered_normally(budget_client):
+    assert Config.QUERY_BUDGET_MODE == "raise"
+    response = await budget_client.get("/products/2")
+    assert response.status_code == 200
+    assert response.json() == {"read": 2}
+
+
+async def test_n_plus_one_route_fails_with_repeated_shape(budget_client):
+    response = await budget_client.get("/products/4")
+
+    assert response.status_code == 500
+    body = response.json()
+    assert body["error_code"] == "query_budget_exceeded"
+    assert "GET /products/{count} issued 4 SQL statements, budget is 2" in body["message"]
+    assert "4x SELECT products.name FROM products WHERE products.id = ?" in body["message"]
+
+
+async def test_large_cart_checkout_stays_within_budget(client, catalog, db):
+    products = [Product(name=f"Test line {index}", price=1.0, category_id=catalog.category_id)
+                for index in range(30)]
+    db.add_all(products)
+    await db.flush()
+    db.add_all([Inventory(product_id=product.id, warehouse_id=catalog.warehouse_ids[0], quantity=5)
+                for product in products])
+    db.add_all([Cart(user_id=catalog.user_id, product_id=product.id, quantity=1) for product in products])
+    await db.commit()
+
+    try:
+        with count_statements() as statements:
+            response = await client.post("/orders/checkout")
+        assert response.status_code == 201, response.text
+        assert len(response.json()["items"]) == 32
+        assert len(statements) <= 20, "\n".join(statements)
+    finally:
+        order_ids = select(Order.id).where(Order.user_id == catalog.user_id)
+        await db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+        await db.execute(delete(Order).where(Order.user_id == catalog.user_id))
+        await db.execute(delete(Product).where(Product.id.in_([product.id for product in products])))
+        await db.commit()
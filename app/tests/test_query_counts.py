@@ -0,0 +1,43 @@
+"""
+SQL statements issued per route. Every route is called for a product with one related row of each
+kind and for one with several, so a relationship loaded per row shows up as a count difference.
+"""
+import pytest
+
+from app.core.cache import product_cache
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+# path template, statements expected; ids are filled from catalog.sparse / catalog.dense
+ROUTES = [
+    ("/products/{product}", 2),
+    ("/products/{product}?fields=name,price", 1),
+    ("/products/{product}/rating", 1),
+    ("/products/{product}/reviews", 1),
+    ("/products/", 1),
+    ("/products/name/?name=widget", 1),
+    ("/product-images/{image}", 1),
+    ("/product-images/", 1),
+    ("/warehouses/{warehouse}", 1),
+    ("/warehouses/", 1),
+    ("/inventory/{inventory}", 1),
+    ("/inventory/", 1),
+    ("/inventory/availability?product_ids={product}", 1),
+    ("/reviews/{review}", 1),
+    ("/cart/", 1),
+    ("/cart/summary", 1),
+    ("/orders/", 1),
+]
+
+
+@pytest.mark.parametrize("path, expected", ROUTES)
+async def test_route_statement_count(client, catalog, path, expected):
+    counts = []
+    for ids in (catalog.sparse, catalog.dense):
+        product_cache.clear()
+        with count_statements() as statements:
+            response = await client.get(path.format(**ids))
+        assert response.status_code == 200, response.text
+        counts.append(len(statements))
+    assert counts == [expected, expected], "\n".join(statements)
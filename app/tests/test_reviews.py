@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.api.models.products import Product
+from app.tests.conftest import count_statements
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_reviews_of_unknown_product_are_404(client):
+    product_id = uuid.uuid4()
+    reviews = await client.get(f"/products/{product_id}/reviews")
+    rating = await client.get(f"/products/{product_id}/rating")
+    assert (reviews.status_code, rating.status_code) == (404, 404)
+
+
+async def test_product_without_reviews_has_empty_page(client, catalog, db):
+    product = Product(name="Test widget unreviewed", description="a test product", price=10.0,
+                      category_id=catalog.category_id)
+    db.add(product)
+    await db.commit()
+    try:
+        with count_statements() as statements:
+            response = await client.get(f"/products/{product.id}/reviews")
+        assert response.status_code == 200, response.text
+        assert response.json()["items"] == []
+        # the empty page is followed by one existence check
+        assert len(statements) == 2, "\n".join(statements)
+    finally:
+        await db.delete(product)
+        await db.commit()
+
+
+@pytest.fixture
+async def products(catalog, db):
+    """Two products with no reviews and no rating row yet"""
+    rows = [Product(name=f"Test widget rated {index}", description="a test product", price=10.0,
+                    category_id=catalog.category_id) for index in range(2)]
+    db.add_all(rows)
+    await db.commit()
+    yield [row.id for row in rows]
+    # reviews and rating rows go with the products
+    for row in rows:
+        await db.delete(row)
+    await db.commit()
+
+
+async def histogram(client, product_id) -> dict:
+    response = await client.get(f"/products/{product_id}/rating")
+    assert response.status_code == 200, response.text
+    rating = response.json()
+    return {"count": rating["review_count"], **{int(bucket): n for bucket, n in rating["histogram"].items() if n}}
+
+
+async def create_review(client, product_id, reviewer_id, rating) -> str:
+    response = await client.post("/reviews/", json={"product_id": str(product_id), "reviewer_id": str(reviewer_id),
+                                                    "rating": rating})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def test_rating_follows_review_changes(client, catalog, products):
+    first, second = products
+    review = await create_review(client, first, catalog.reviewer_ids[0], 4)
+    await create_review(client, first, catalog.reviewer_ids[1], 2)
+    assert await histogram(client, first) == {"count": 2, 4: 1, 2: 1}
+
+    assert (await client.put(f"/reviews/{review}", json={"rating": 5})).status_code == 200
+    assert await histogram(client, first) == {"count": 2, 5: 1, 2: 1}
+
+    response = await client.put(f"/reviews/{review}", json={"product_id": str(second), "rating": 3})
+    assert response.status_code == 200, response.text
+    assert await histogram(client, first) == {"count": 1, 2: 1}
+    assert await histogram(client, second) == {"count": 1, 3: 1}
+
+    assert (await client.delete(f"/reviews/{review}")).status_code == 204
+    assert await histogram(client, second) == {"count": 0}
+    assert await histogram(client, first) == {"count": 1, 2: 1}
+
+
+async def test_null_rating_is_rejected(client, catalog, products):
+    review = await create_review(client, products[0], catalog.reviewer_ids[0], 4)
+    response = await client.put(f"/reviews/{review}", json={"rating": None})
+    assert response.status_code == 400, response.text
+    assert await histogram(client, products[0]) == {"count": 1, 4: 1}
+
+
+async def test_concurrent_updates_and_deletes_count_once(client, catalog, products):
+    review = await create_review(client, products[0], catalog.reviewer_ids[0], 4)
+
+    responses = await asyncio.gather(*(client.put(f"/reviews/{review}", json={"rating": 5}) for _ in range(2)))
+    assert [response.status_code for response in responses] == [200, 200]
+    assert await histogram(client, products[0]) == {"count": 1, 5: 1}
+
+    responses = await asyncio.gather(*(client.delete(f"/reviews/{review}") for _ in range(2)))
+    assert sorted(response.status_code for response in responses) == [204, 404]
+    assert await histogram(client, products[0]) == {"count": 0}
+
+
+async def test_opposite_moves_do_not_deadlock(client, catalog, products):
+    first, second = products
+    reviews = [await create_review(client, first, catalog.reviewer_ids[0], 4),
+               await create_review(client, second, catalog.reviewer_ids[1], 2)]
+
+    responses = await asyncio.gather(
+        client.put(f"/reviews/{reviews[0]}", json={"product_id": str(second)}),
+        client.put(f"/reviews/{reviews[1]}", json={"product_id": str(first)}),
+    )
+    assert [response.status_code for response in responses] == [200, 200]
+    assert await histogram(client, first) == {"count": 1, 2: 1}
+    assert await histogram(client, second) == {"count": 1, 4: 1}
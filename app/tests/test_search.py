@@ -0,0 +1,18 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_snippet_highlights_name_only_match(client, catalog):
+    # "widget" appears in the catalog products' names, not their descriptions
+    response = await client.get("/products/name/?name=widget&fields=name,snippet")
+    assert response.status_code == 200, response.text
+    hits = {hit["name"]: hit["snippet"] for hit in response.json()["items"]}
+    assert "<mark>widget</mark>" in hits["Test widget sparse"]
+    assert "test product" in hits["Test widget sparse"]
+
+
+async def test_snippet_highlights_description_match(client, catalog):
+    response = await client.get("/products/name/?name=product&fields=name,snippet")
+    hits = {hit["name"]: hit["snippet"] for hit in response.json()["items"]}
+    assert "<mark>product</mark>" in hits["Test widget dense"]